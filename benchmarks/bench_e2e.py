@@ -0,0 +1,179 @@
+"""End-to-end benchmark: drives LinkedInBot in headless Chrome against the local fixture server.
+
+    python benchmarks/bench_e2e.py --profiles 60 --mode pipeline --lean
+    python benchmarks/bench_e2e.py --json results.json
+    python benchmarks/bench_e2e.py --baseline results.json     # exit 1 on regression
+
+Reports profiles/sec, p50/p95 per-profile latency and peak RSS of the chromedriver/Chrome
+process tree. Needs Chrome and a chromedriver (CHROMEDRIVER_PATH or the driver cache).
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+sys.path.insert(0, BENCH_DIR)
+
+from fixture_server import FixtureServer, PROFILE_TEMPLATES  # noqa: E402
+from linkedin_bot import LinkedInBot, MODE_PIPELINE, MODE_TWO_PHASE  # noqa: E402
+from browser_watchdog import process_tree_rss  # noqa: E402
+
+BENCH_USERNAME = 'bench@example.com'
+BENCH_PASSWORD = 'benchmark'
+BENCH_NOTE = "Hi, benchmark note."
+
+
+class RssSampler:
+    """Background thread tracking the peak RSS of a process tree"""
+
+    def __init__(self, root_pid, interval=0.25):
+        self.root_pid = root_pid
+        self.interval = interval
+        self.peak = 0
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def run(self):
+        while not self.stopped.is_set():
+            self.peak = max(self.peak, process_tree_rss(self.root_pid) or 0)
+            self.stopped.wait(self.interval)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+        return self.peak
+
+
+class DurationCollector(logging.Handler):
+    """Collects the per-profile durations LinkedInBot attaches to its 'Profile done' records"""
+
+    def __init__(self):
+        super().__init__()
+        self.per_profile = defaultdict(float)
+
+    def emit(self, record):
+        durations = getattr(record, 'durations', None)
+        if durations:
+            self.per_profile[record.profile_url] += sum(durations.values())
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def write_profiles_csv(server, count, path):
+    kinds = list(PROFILE_TEMPLATES)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('Name,Profile_URL\n')
+        for i in range(count):
+            slug = f'{kinds[i % len(kinds)]}-{i}'
+            f.write(f'{slug},{server.profile_url(slug)}\n')
+
+
+def run_benchmark(profiles, mode, lean, latency, headless=True):
+    workdir = tempfile.mkdtemp(prefix='linkedin-bench-')
+    os.chdir(workdir)
+    with FixtureServer(latency=latency) as server:
+        csv_path = os.path.join(workdir, 'profiles.csv')
+        write_profiles_csv(server, profiles, csv_path)
+
+        bot = LinkedInBot(persist_session=False, base_url=server.base_url, locator_stats_path=None)
+        collector = DurationCollector()
+        logging.getLogger().addHandler(collector)
+        setup_start = time.perf_counter()
+        bot.setup_browser(headless=headless, lean=lean)
+        sampler = RssSampler(bot.browser.service.process.pid).start()
+        try:
+            login_start = time.perf_counter()
+            if not bot.login_to_linkedin(BENCH_USERNAME, BENCH_PASSWORD):
+                raise RuntimeError('Login against the fixture server failed')
+            run_start = time.perf_counter()
+            bot.run_profiles(csv_path, BENCH_NOTE, BENCH_USERNAME, mode=mode)
+            run_end = time.perf_counter()
+        finally:
+            peak_rss = sampler.stop()
+            bot.browser.quit()
+            bot.close_state_store()
+            logging.getLogger().removeHandler(collector)
+
+    latencies = list(collector.per_profile.values())
+    elapsed = run_end - run_start
+    return {
+        'profiles': profiles,
+        'mode': mode,
+        'lean': lean,
+        'latency': latency,
+        'startup_seconds': login_start - setup_start,
+        'login_seconds': run_start - login_start,
+        'run_seconds': elapsed,
+        'profiles_per_second': len(latencies) / elapsed if elapsed else 0.0,
+        'p50_seconds': percentile(latencies, 50),
+        'p95_seconds': percentile(latencies, 95),
+        'peak_rss_mb': peak_rss / (1024 * 1024),
+    }
+
+
+def check_regression(result, baseline, tolerance):
+    """Return the list of metrics that got worse than baseline by more than tolerance"""
+    regressions = []
+    if result['profiles_per_second'] < baseline['profiles_per_second'] * (1 - tolerance):
+        regressions.append('profiles_per_second')
+    for metric in ('p50_seconds', 'p95_seconds', 'peak_rss_mb'):
+        if result[metric] > baseline[metric] * (1 + tolerance):
+            regressions.append(metric)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='End-to-end LinkedInBot benchmark against local fixtures')
+    parser.add_argument('--profiles', type=int, default=30)
+    parser.add_argument('--mode', choices=[MODE_PIPELINE, MODE_TWO_PHASE], default=MODE_PIPELINE)
+    parser.add_argument('--lean', action='store_true', help='Use the lean page-load mode')
+    parser.add_argument('--latency', type=float, default=0.0, help='Simulated server latency per request (s)')
+    parser.add_argument('--headed', action='store_true', help='Show the browser window')
+    parser.add_argument('--json', help='Write the results to this file')
+    parser.add_argument('--baseline', help='Compare against a previous --json result')
+    parser.add_argument('--tolerance', type=float, default=0.10, help='Allowed relative regression')
+    args = parser.parse_args()
+
+    output_path = os.path.abspath(args.json) if args.json else None
+    baseline_path = os.path.abspath(args.baseline) if args.baseline else None
+    result = run_benchmark(args.profiles, args.mode, args.lean, args.latency, headless=not args.headed)
+
+    print(f"mode={result['mode']} lean={result['lean']} profiles={result['profiles']}")
+    print(f"  startup        {result['startup_seconds']:.2f}s")
+    print(f"  login          {result['login_seconds']:.2f}s")
+    print(f"  run            {result['run_seconds']:.2f}s")
+    print(f"  profiles/sec   {result['profiles_per_second']:.2f}")
+    print(f"  p50 latency    {result['p50_seconds'] * 1000:.0f} ms")
+    print(f"  p95 latency    {result['p95_seconds'] * 1000:.0f} ms")
+    print(f"  peak RSS       {result['peak_rss_mb']:.0f} MB")
+
+    if output_path:
+        with open(output_path, 'w') as f:
+            json.dump(result, f, indent=2)
+    if baseline_path:
+        with open(baseline_path, 'r') as f:
+            regressions = check_regression(result, json.load(f), args.tolerance)
+        if regressions:
+            print(f"Regression beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,204 @@
+"""Microbenchmarks of LinkedInBot's own Python-side overhead, using SimulatedDriver instead of Chrome.
+
+    python benchmarks/bench_micro.py                                   # every suite at 1k and 10k
+    python benchmarks/bench_micro.py --suite run --profiles 1000 10000 100000
+    python benchmarks/bench_micro.py --suite run --mode two_phase --workers 4 --latency 0.02
+    python benchmarks/bench_micro.py --json micro.json
+    python benchmarks/bench_micro.py --baseline micro.json             # exit 1 on regression
+
+With the default zero driver latency every second measured is the bot's: CSV ingest, state
+store writes, logging, scheduling and wait/locator bookkeeping. The per-unit cost should stay
+flat as the profile count grows.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+sys.path.insert(0, BENCH_DIR)
+
+from sim_driver import SimulatedDriver, DEFAULT_OUTCOMES  # noqa: E402
+from browser_watchdog import BrowserWatchdog  # noqa: E402
+from ingest import ingest_profiles  # noqa: E402
+from linkedin_bot import LinkedInBot, MODE_PIPELINE, MODE_TWO_PHASE  # noqa: E402
+from recovery import RetryPolicy  # noqa: E402
+from state_store import ProcessedUrlStore  # noqa: E402
+from utils import setup_logging, stop_logging  # noqa: E402
+
+BENCH_USERNAME = 'micro@example.com'
+BENCH_PASSWORD = 'benchmark'
+BENCH_NOTE = "Hi, benchmark note."
+SUITES = ['ingest', 'store', 'logging', 'run']
+
+
+def profile_url(i):
+    return f'https://www.linkedin.com/in/sim-{i}/'
+
+
+def write_profiles_csv(count, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('Name,Profile_URL\n')
+        for i in range(count):
+            f.write(f'sim-{i},{profile_url(i)}\n')
+            if i % 100 == 0:
+                # Same profile spelled differently, for the de-duplication path
+                f.write(f'sim-{i},http://linkedin.com/in/SIM-{i}?trk=dup\n')
+
+
+def parse_outcomes(text):
+    outcomes = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        outcomes[name.strip()] = float(weight)
+    return outcomes
+
+
+def bench_ingest(count, args):
+    csv_path = os.path.abspath('profiles.csv')
+    write_profiles_csv(count, csv_path)
+    with ProcessedUrlStore('ingest.db') as store:
+        # Half the profiles already checked today, so the TTL filter has work to do
+        store.upsert_many((profile_url(i), "No Connect Option") for i in range(0, count, 2))
+        start = time.perf_counter()
+        queue, stats = ingest_profiles(csv_path, store, phase='pipeline')
+        elapsed = time.perf_counter() - start
+    return {'seconds': elapsed, 'us_per_row': elapsed * 1e6 / stats.total, 'queued': len(queue)}
+
+
+def bench_store(count, args):
+    urls = [profile_url(i) for i in range(count)]
+    with ProcessedUrlStore('store.db') as store:
+        start = time.perf_counter()
+        for url in urls:
+            store.upsert(url, "Not Connected")
+        single = time.perf_counter() - start
+        start = time.perf_counter()
+        for i in range(0, count, 100):
+            store.upsert_many((url, "Already Connected") for url in urls[i:i + 100])
+        batched = time.perf_counter() - start
+        start = time.perf_counter()
+        records = store.get_records(urls)
+        lookup = time.perf_counter() - start
+    assert len(records) == count
+    return {
+        'us_per_upsert': single * 1e6 / count,
+        'us_per_batched_upsert': batched * 1e6 / count,
+        'us_per_lookup': lookup * 1e6 / count,
+    }
+
+
+def bench_logging(count, args):
+    setup_logging(log_file='micro.log', console=False)
+    logger = logging.getLogger('linkedin_bot')
+    start = time.perf_counter()
+    for i in range(count):
+        logger.info("Profile done: %s -> %s (%s)", profile_url(i), "Not Connected", "load 0.00s",
+                    extra={'profile_url': profile_url(i), 'status': "Not Connected", 'durations': {'load': 0.0}})
+    emitted = time.perf_counter() - start
+    stop_logging()
+    flushed = time.perf_counter() - start
+    return {'us_per_record_emit': emitted * 1e6 / count, 'us_per_record_flushed': flushed * 1e6 / count}
+
+
+def bench_run(count, args):
+    csv_path = os.path.abspath('profiles.csv')
+    write_profiles_csv(count, csv_path)
+    setup_logging(log_file='micro.log', console=False)
+    drivers = []
+
+    def launch():
+        # One seed for every browser: a profile must have the same page shape whichever worker loads it
+        driver = SimulatedDriver(latency=args.latency, outcomes=args.outcomes, error_rate=args.error_rate)
+        drivers.append(driver)
+        return driver
+
+    bot = LinkedInBot(persist_session=False, metrics_path=None, locator_stats_path=None, driver_factory=launch,
+                      scan_workers=args.workers, wait_timeouts={'profile_load': 0.2},
+                      watchdog=BrowserWatchdog(max_rss_mb=None, max_profiles=None))
+    bot.retry_policy = RetryPolicy(base_delay=0.0)
+    try:
+        bot.setup_browser(headless=True)
+        if not bot.login_to_linkedin(BENCH_USERNAME, BENCH_PASSWORD):
+            raise RuntimeError('Login against the simulated driver failed')
+        start = time.perf_counter()
+        bot.run_profiles(csv_path, BENCH_NOTE, BENCH_USERNAME, mode=args.mode)
+        ran = time.perf_counter() - start
+        stop_logging()
+        elapsed = time.perf_counter() - start
+    finally:
+        bot.close_state_store()
+
+    calls = sum((driver.calls for driver in drivers), Counter())
+    processed = bot.metrics.profiles_done
+    stages = sorted(bot.metrics.histograms.items(), key=lambda item: -item[1].sum)[:5]
+    return {
+        'seconds': elapsed,
+        'us_per_profile': elapsed * 1e6 / processed,
+        'us_per_profile_before_log_flush': ran * 1e6 / processed,
+        'driver_calls_per_profile': sum(calls.values()) / processed,
+        'invitations_sent': sum(driver.invitations_sent for driver in drivers),
+        'top_stages': {stage: round(h.sum, 3) for stage, h in stages},
+    }
+
+
+BENCHMARKS = {'ingest': bench_ingest, 'store': bench_store, 'logging': bench_logging, 'run': bench_run}
+
+
+def check_regression(results, baseline, tolerance):
+    """Return the per-unit ('us_per_*') metrics that got slower than baseline by more than tolerance"""
+    regressions = []
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            previous = baseline.get(name, {}).get(metric)
+            if metric.startswith('us_per_') and previous and value > previous * (1 + tolerance):
+                regressions.append(f'{name}.{metric}')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmarks of LinkedInBot's Python-side overhead")
+    parser.add_argument('--suite', choices=SUITES, action='append', help='Suite to run (repeatable, default all)')
+    parser.add_argument('--profiles', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--mode', choices=[MODE_PIPELINE, MODE_TWO_PHASE], default=MODE_PIPELINE)
+    parser.add_argument('--workers', type=int, default=1, help='Pre-scan browsers in two_phase mode')
+    parser.add_argument('--latency', type=float, default=0.0, help='Simulated seconds per driver call')
+    parser.add_argument('--outcomes', type=parse_outcomes, default=dict(DEFAULT_OUTCOMES),
+                        help='Page shape weights, e.g. connected=0.3,invite=0.5,no_connect=0.2')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Chance a profile load raises')
+    parser.add_argument('--json', help='Write the results to this file')
+    parser.add_argument('--baseline', help='Compare against a previous --json result')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed relative regression')
+    args = parser.parse_args()
+
+    output_path = os.path.abspath(args.json) if args.json else None
+    baseline_path = os.path.abspath(args.baseline) if args.baseline else None
+    results = {}
+    for suite in args.suite or SUITES:
+        for count in args.profiles:
+            os.chdir(tempfile.mkdtemp(prefix=f'linkedin-micro-{suite}-'))
+            result = BENCHMARKS[suite](count, args)
+            results[f'{suite}@{count}'] = result
+            print(f"{suite:<8} n={count:<8} " + '  '.join(
+                f"{metric} {value:.2f}" if isinstance(value, float) else f"{metric} {value}"
+                for metric, value in result.items()
+            ))
+
+    if output_path:
+        with open(output_path, 'w') as f:
+            json.dump(results, f, indent=2)
+    if baseline_path:
+        with open(baseline_path, 'r') as f:
+            regressions = check_regression(results, json.load(f), args.tolerance)
+        if regressions:
+            print(f"Regression beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+"""Local stand-in for the pages LinkedInBot drives, served from benchmarks/fixtures.
+
+Routes:
+    GET  /login              login form (#username, #password, Sign in button)
+    POST /login              sets the session cookie and redirects to /feed/
+    GET  /feed/              #global-nav-search when signed in, otherwise redirects to /login
+    GET  /in/<slug>/         profile page; the slug prefix picks the DOM shape:
+                             connected-*, invite-*, more-*; anything else is picked by hash
+    GET  /static/<file>      fixture assets
+"""
+import hashlib
+import html
+import os
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+SESSION_COOKIE = 'li_at'
+PROFILE_TEMPLATES = {
+    'connected': 'profile_connected.html',
+    'invite': 'profile_invite.html',
+    'more': 'profile_more_actions.html',
+}
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def profile_kind(slug):
+    for kind in PROFILE_TEMPLATES:
+        if slug.startswith(f'{kind}-'):
+            return kind
+    kinds = sorted(PROFILE_TEMPLATES)
+    return kinds[int(hashlib.md5(slug.encode()).hexdigest(), 16) % len(kinds)]
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_page(self, body, status=200, content_type='text/html; charset=utf-8', headers=None):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def redirect(self, location, headers=None):
+        self.send_response(303)
+        self.send_header('Location', location)
+        self.send_header('Content-Length', '0')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+
+    def signed_in(self):
+        return f'{SESSION_COOKIE}=' in self.headers.get('Cookie', '')
+
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        path = urlsplit(self.path).path
+        if path == '/login':
+            self.send_page(self.server.pages['login.html'])
+        elif path == '/feed/':
+            if self.signed_in():
+                self.send_page(self.server.pages['feed.html'])
+            else:
+                self.redirect('/login')
+        elif path.startswith('/in/'):
+            slug = path[len('/in/'):].strip('/')
+            template = self.server.pages[PROFILE_TEMPLATES[profile_kind(slug)]]
+            name = html.escape(slug.replace('-', ' ').title())
+            self.send_page(template.format(name=name, invite_modal=self.server.pages['invite_modal.html']))
+        elif path == '/static/invite_modal.js':
+            self.send_page(self.server.pages['invite_modal.js'], content_type='application/javascript')
+        else:
+            self.send_page('Not found', status=404, content_type='text/plain')
+
+    def do_POST(self):
+        time.sleep(self.server.latency)
+        length = int(self.headers.get('Content-Length', 0))
+        self.rfile.read(length)
+        if urlsplit(self.path).path == '/login':
+            self.redirect('/feed/', headers={'Set-Cookie': f'{SESSION_COOKIE}=benchmark; Path=/'})
+        else:
+            self.send_page('Not found', status=404, content_type='text/plain')
+
+
+class FixtureServer:
+    """Serves the fixtures on 127.0.0.1 from a background thread"""
+
+    def __init__(self, port=0, latency=0.0):
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), FixtureHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.latency = latency
+        self.httpd.pages = {name: load_fixture(name) for name in os.listdir(FIXTURES_DIR)}
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def profile_url(self, slug):
+        return f'{self.base_url}/in/{slug}/'
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Serve the benchmark fixtures')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='Per-request delay in seconds')
+    args = parser.parse_args()
+    server = FixtureServer(args.port, args.latency)
+    print(f'Serving fixtures on {server.base_url}')
+    server.httpd.serve_forever()
@@ -0,0 +1,24 @@
+// Mimics the invite dialog: rendered a tick after the click, like the real page
+function openInviteModal() {
+  setTimeout(function () {
+    document.getElementById('invite-choice').style.display = '';
+    document.getElementById('invite-note').style.display = 'none';
+    document.getElementById('invite-modal').style.display = '';
+  }, 50);
+}
+
+function showNoteForm() {
+  document.getElementById('invite-choice').style.display = 'none';
+  document.getElementById('invite-note').style.display = '';
+}
+
+function closeInviteModal() {
+  setTimeout(function () {
+    document.getElementById('invite-modal').style.display = 'none';
+  }, 50);
+}
+
+function toggleMoreActions() {
+  var menu = document.getElementById('more-actions-menu');
+  menu.style.display = menu.style.display === 'none' ? '' : 'none';
+}
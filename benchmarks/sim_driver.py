@@ -0,0 +1,215 @@
+"""In-process stand-in for the Chrome WebDriver subset LinkedInBot uses.
+
+    driver = SimulatedDriver(latency={'get': 0.2}, outcomes={'connected': 0.3, 'invite': 0.7})
+    bot = LinkedInBot(driver_factory=lambda: driver, ...)
+
+Implements get, find_element(s), execute_script (PROBE_SCRIPT), cookies, page_source and
+elements with is_displayed, is_enabled, click, send_keys and get_attribute. Each profile URL
+gets a page shape drawn from `outcomes` (deterministic per URL and seed):
+
+    connected    1st badge, Message and More buttons
+    invite       Connect button opening the invite modal, More button
+    no_connect   More button only
+    missing      no profile actions; the profile_load wait times out
+
+`latency` is seconds per call, a float for every call or a {method: seconds} dict.
+`error_rate` is the chance that a profile get() raises a TimeoutException, drawn per call.
+"""
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from selenium.common.exceptions import NoSuchElementException, TimeoutException  # noqa: E402
+from locators import LOCATORS, PROBE_SCRIPT  # noqa: E402
+
+SESSION_COOKIE = 'li_at'
+DEFAULT_OUTCOMES = {'connected': 0.3, 'invite': 0.5, 'no_connect': 0.2}
+
+PAGE_ELEMENTS = {
+    'login': {'username', 'password', 'sign_in'},
+    'feed': {'global-nav-search'},
+    'connected': {'already_connected_indicator', 'message_option', 'more_options'},
+    'invite': {'connect_to_invite', 'invite_options', 'more_options'},
+    'no_connect': {'more_options'},
+    'missing': set(),
+    'blank': set(),
+}
+MODAL_ELEMENTS = {
+    None: set(),
+    'choice': {'send_note_button', 'send_without_note_button'},
+    'note': {'note_text_box', 'send_invitation_confirmation_button'},
+}
+
+# Login page and feed lookups the bot makes outside LOCATORS
+STATIC_LOCATORS = {
+    ('id', 'username'): 'username',
+    ('id', 'password'): 'password',
+    ('css selector', "button[aria-label='Sign in']"): 'sign_in',
+    ('id', 'global-nav-search'): 'global-nav-search',
+}
+
+
+class SimulatedElement:
+    def __init__(self, driver, key):
+        self.driver = driver
+        self.key = key
+
+    def is_displayed(self):
+        self.driver.call('is_displayed')
+        return self.key in self.driver.visible_keys()
+
+    def is_enabled(self):
+        self.driver.call('is_enabled')
+        return True
+
+    def click(self):
+        self.driver.call('click')
+        self.driver.on_click(self.key)
+
+    def send_keys(self, text):
+        self.driver.call('send_keys')
+        self.driver.typed[self.key] = text
+
+    def get_attribute(self, name):
+        self.driver.call('get_attribute')
+        return self.key if name == 'id' else None
+
+
+class SimulatedDriver:
+    def __init__(self, latency=0.0, outcomes=None, error_rate=0.0, seed=0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.outcomes = list((outcomes or DEFAULT_OUTCOMES).items())
+        self.total_weight = sum(weight for _, weight in self.outcomes)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.locators = dict(STATIC_LOCATORS)
+        for key, chain in LOCATORS.items():
+            for locator in chain:
+                self.locators[tuple(locator)] = key
+        self.calls = Counter()
+        self.calls_lock = threading.Lock()
+        self.cookies = {}
+        self.typed = {}
+        self.current_url = 'about:blank'
+        self.page = 'blank'
+        self.modal = None
+        self.invitations_sent = 0
+        self.notes_sent = 0
+
+    def call(self, method):
+        with self.calls_lock:
+            self.calls[method] += 1
+        delay = self.latency.get(method, 0.0) if isinstance(self.latency, dict) else self.latency
+        if delay:
+            time.sleep(delay)
+
+    @property
+    def logged_in(self):
+        return SESSION_COOKIE in self.cookies
+
+    def outcome_for(self, url):
+        roll = random.Random(f'{self.seed}:{url}').random() * self.total_weight
+        for outcome, weight in self.outcomes:
+            roll -= weight
+            if roll < 0:
+                return outcome
+        return self.outcomes[-1][0]
+
+    def get(self, url):
+        self.call('get')
+        self.current_url = url
+        self.modal = None
+        self.typed = {}
+        path = urlsplit(url).path
+        if path.startswith('/in/'):
+            self.page = self.outcome_for(url)
+            if self.error_rate and self.rng.random() < self.error_rate:
+                raise TimeoutException('simulated page load timeout')
+        elif path.startswith('/feed'):
+            self.page = 'feed' if self.logged_in else 'login'
+        elif path.startswith('/login'):
+            self.page = 'feed' if self.logged_in else 'login'
+        else:
+            self.page = 'blank'
+
+    def visible_keys(self):
+        return PAGE_ELEMENTS[self.page] | MODAL_ELEMENTS[self.modal]
+
+    def on_click(self, key):
+        if key == 'sign_in':
+            self.cookies[SESSION_COOKIE] = {'name': SESSION_COOKIE, 'value': 'simulated', 'path': '/'}
+            self.page = 'feed'
+        elif key == 'connect_to_invite':
+            self.modal = 'choice'
+        elif key == 'send_note_button':
+            self.modal = 'note'
+        elif key in ('send_without_note_button', 'send_invitation_confirmation_button'):
+            self.invitations_sent += 1
+            self.notes_sent += key == 'send_invitation_confirmation_button'
+            self.modal = None
+
+    def lookup(self, by, value):
+        key = self.locators.get((by, value))
+        if key is None or key not in self.visible_keys():
+            return None
+        return SimulatedElement(self, key)
+
+    def find_element(self, by, value):
+        self.call('find_element')
+        element = self.lookup(by, value)
+        if element is None:
+            raise NoSuchElementException(f'simulated: no element {by}={value}')
+        return element
+
+    def find_elements(self, by, value):
+        self.call('find_elements')
+        element = self.lookup(by, value)
+        return [element] if element is not None else []
+
+    def execute_script(self, script, *args):
+        self.call('execute_script')
+        if script != PROBE_SCRIPT:
+            return None
+        result = {}
+        for key, chain in args[0].items():
+            element, tried = None, 0
+            for by, value in chain:
+                tried += 1
+                element = self.lookup(by, value)
+                if element is not None:
+                    break
+            # Every visible-key element is displayed; lookups report a nominal 10 us each
+            result[key] = [element is not None, element is not None, element, [0.01] * tried]
+        return result
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.call('execute_cdp_cmd')
+        return {}
+
+    @property
+    def page_source(self):
+        self.call('page_source')
+        keys = ''.join(f'<span data-key="{key}"></span>' for key in sorted(self.visible_keys()))
+        return f'<html><body><main>{keys}</main></body></html>'
+
+    def get_cookies(self):
+        self.call('get_cookies')
+        return [dict(cookie) for cookie in self.cookies.values()]
+
+    def add_cookie(self, cookie):
+        self.call('add_cookie')
+        self.cookies[cookie['name']] = dict(cookie)
+
+    def delete_all_cookies(self):
+        self.call('delete_all_cookies')
+        self.cookies = {}
+
+    def quit(self):
+        self.call('quit')
@@ -0,0 +1,81 @@
+import os
+import time
+from collections import defaultdict
+
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+PROC_DIR = '/proc'
+
+
+def process_tree_rss(root_pid):
+    """Sum RSS in bytes over root_pid and all of its descendants, read from /proc.
+
+    Returns None where /proc is not available (Windows, macOS).
+    """
+    if not os.path.isdir(PROC_DIR):
+        return None
+    children = defaultdict(list)
+    for entry in os.listdir(PROC_DIR):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'{PROC_DIR}/{entry}/stat', 'r') as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # Fields after the parenthesised command name; ppid is the second one
+        ppid = int(stat.rsplit(')', 1)[1].split()[1])
+        children[ppid].append(int(entry))
+
+    total = 0
+    pending = [root_pid]
+    while pending:
+        pid = pending.pop()
+        try:
+            with open(f'{PROC_DIR}/{pid}/statm', 'r') as f:
+                total += int(f.read().split()[1]) * PAGE_SIZE
+        except OSError:
+            continue
+        pending.extend(children.get(pid, []))
+    return total
+
+
+class BrowserWatchdog:
+    """Decides at profile boundaries when the browser should be recycled.
+
+    Triggers when the chromedriver/Chrome process tree passes max_rss_mb, or after
+    max_profiles navigations on one browser. Either limit can be disabled with None.
+    """
+
+    def __init__(self, max_rss_mb=1500, max_profiles=250, sample_interval=5.0):
+        self.max_rss_mb = max_rss_mb
+        self.max_profiles = max_profiles
+        self.sample_interval = sample_interval
+        self.profiles = 0
+        self.last_sample = 0.0
+        self.last_rss_mb = None
+        self.peak_rss_mb = 0.0
+
+    def reset(self):
+        """Call after a new browser has been launched"""
+        self.profiles = 0
+        self.last_sample = 0.0
+
+    def sample(self, root_pid):
+        rss = process_tree_rss(root_pid)
+        self.last_sample = time.monotonic()
+        if rss is None:
+            return None
+        self.last_rss_mb = rss / (1024 * 1024)
+        self.peak_rss_mb = max(self.peak_rss_mb, self.last_rss_mb)
+        return self.last_rss_mb
+
+    def profile_done(self, root_pid):
+        """Count a profile; returns a reason string if the browser should be recycled, else None"""
+        self.profiles += 1
+        if self.max_profiles and self.profiles >= self.max_profiles:
+            return f"{self.profiles} profiles on this browser"
+        if self.max_rss_mb and root_pid and time.monotonic() - self.last_sample >= self.sample_interval:
+            rss_mb = self.sample(root_pid)
+            if rss_mb is not None and rss_mb >= self.max_rss_mb:
+                return f"browser RSS {rss_mb:.0f} MB over {self.max_rss_mb} MB"
+        return None
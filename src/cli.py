@@ -0,0 +1,244 @@
+"""Command line batch runner.
+
+    python src/cli.py run --csv profiles.csv --account me@example.com --note-file note.txt
+    python src/cli.py dry-run --csv profiles.csv --account me@example.com --show 20
+    python src/cli.py report --account me@example.com --output processed.csv
+    python src/cli.py classify --account me@example.com --workers 8 --output offline.csv
+
+Only 'run' imports linkedin_bot (Selenium, and webdriver_manager when the driver cache misses), so
+--help, dry runs and reports start without loading the browser stack. The browser is headless
+unless --headed is given, which makes the runner usable on servers without a display.
+The password is read from $LINKEDIN_PASSWORD, or prompted for without echo.
+"""
+import argparse
+import csv
+import getpass
+import os
+import sys
+import time
+from collections import Counter
+from datetime import timedelta
+
+from run_options import MODE_PIPELINE, MODE_TWO_PHASE, NOTE_IF_FITS, NOTE_POLICIES, RUN_MODES
+from scheduler import ORDER_CSV, ORDER_STALENESS
+
+PASSWORD_ENV = 'LINKEDIN_PASSWORD'
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+# The run stopped before the end (cancelled, circuit breaker, error); rerun with --resume
+EXIT_INCOMPLETE = 2
+EXIT_INTERRUPTED = 130
+
+# Phase whose TTLs decide what a dry run would visit first
+DRY_RUN_PHASES = {MODE_PIPELINE: 'pipeline', MODE_TWO_PHASE: 'pre_scan'}
+
+
+def has_display():
+    if not sys.platform.startswith('linux'):
+        return True
+    return bool(os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+
+
+def read_note(args):
+    if args.note_file:
+        with open(args.note_file, 'r', encoding='utf-8') as f:
+            return f.read().strip()
+    return args.note or ''
+
+
+def open_existing_store(account):
+    """Open the account's state store without creating one; None if the account has no store yet"""
+    from state_store import ProcessedUrlStore, state_store_filename
+
+    path = state_store_filename(account)
+    if not os.path.exists(path):
+        return None
+    return ProcessedUrlStore(path).open()
+
+
+def run_command(args):
+    password = os.environ.get(PASSWORD_ENV) or getpass.getpass(f"LinkedIn password for {args.account}: ")
+    note = read_note(args)
+
+    from linkedin_bot import LinkedInBot
+
+    options = {'metrics_path': args.output} if args.output else {}
+    bot = LinkedInBot(log_json=args.log_json, note_policy=args.note_policy, queue_order=args.order,
+                      capture_snapshots=args.capture_snapshots, scan_workers=args.concurrency,
+                      max_rate=args.max_rate, **options)
+    bot.logger.info("=== LinkedIn Automation Script Started ===")
+    bot.logger.info(f"Using CSV file: {args.csv}")
+    start_time = time.monotonic()
+    try:
+        bot.setup_browser(headless=not args.headed, driver_path=args.driver_path,
+                          username=args.account, lean=args.lean)
+        if not bot.login_to_linkedin(args.account, password):
+            bot.logger.error("Login failed, exiting script")
+            return EXIT_FAILED
+        completed = bot.run_profiles(args.csv, note, args.account, mode=args.mode, resume=args.resume)
+        return EXIT_OK if completed else EXIT_INCOMPLETE
+    except KeyboardInterrupt:
+        bot.logger.info("Interrupted, progress is checkpointed; rerun with --resume to continue")
+        return EXIT_INTERRUPTED
+    except Exception as e:
+        bot.logger.error(f"Critical error in main execution: {str(e)}")
+        return EXIT_FAILED
+    finally:
+        if bot.browser is not None:
+            try:
+                bot.browser.quit()
+            except Exception as e:
+                bot.logger.error(f"Error while quitting the browser: {str(e)}")
+        bot.close_state_store()
+        duration = timedelta(seconds=round(time.monotonic() - start_time))
+        bot.logger.info(f"=== Script completed in {duration} ===")
+
+
+def dry_run_command(args):
+    from ingest import ingest_profiles
+    from scheduler import RevalidationScheduler
+
+    state_store = open_existing_store(args.account) if args.account else None
+    if args.account and state_store is None:
+        print(f"No state store for {args.account} yet, every valid profile is due")
+    try:
+        queue, stats = ingest_profiles(args.csv, state_store, RevalidationScheduler(order=args.order),
+                                       DRY_RUN_PHASES[args.mode])
+    finally:
+        if state_store is not None:
+            state_store.close()
+    print(f"{args.csv}: {stats}")
+    for row_number, url in queue[:args.show]:
+        print(f"  row {row_number}: {url}")
+    if len(queue) > args.show > 0:
+        print(f"  ... {len(queue) - args.show} more")
+    return EXIT_OK
+
+
+def report_command(args):
+    state_store = open_existing_store(args.account)
+    if state_store is None:
+        print(f"No state store for {args.account}")
+        return EXIT_FAILED
+    with state_store:
+        counts = state_store.count_by_status()
+        print(f"{args.account}: {sum(counts.values())} processed profiles")
+        for status, count in counts.items():
+            print(f"  {status:<20} {count}")
+        if args.csv:
+            checkpoint = state_store.load_checkpoint(os.path.abspath(args.csv))
+            if checkpoint is None:
+                print(f"No checkpoint for {args.csv}")
+            else:
+                print(f"Checkpoint for {args.csv}: {checkpoint['mode']} {checkpoint['phase']} "
+                      f"row {checkpoint['row_number']} at {checkpoint['timestamp']}, "
+                      f"counters {checkpoint['counters']}")
+        if args.output:
+            records = state_store.load_all()
+            with open(args.output, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(['url', 'status', 'timestamp'])
+                for url, record in sorted(records.items()):
+                    writer.writerow([url, record['status'], record['timestamp']])
+            print(f"Wrote {len(records)} records to {args.output}")
+    return EXIT_OK
+
+
+def classify_command(args):
+    from snapshots import SnapshotStore, classify_snapshots, snapshot_store_filename
+
+    path = snapshot_store_filename(args.account)
+    if not os.path.exists(path):
+        print(f"No snapshots for {args.account}; capture some with 'run --capture-snapshots'")
+        return EXIT_FAILED
+    with SnapshotStore(path) as snapshots:
+        if args.prune:
+            snapshots.prune()
+        results = classify_snapshots(snapshots, workers=args.workers)
+    print(f"{args.account}: {len(results)} snapshots classified")
+    for status, count in Counter(results.values()).most_common():
+        print(f"  {status:<20} {count}")
+    if args.output:
+        state_store = open_existing_store(args.account)
+        stored = state_store.get_records(list(results)) if state_store is not None else {}
+        if state_store is not None:
+            state_store.close()
+        with open(args.output, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['url', 'offline_status', 'stored_status'])
+            for url, status in sorted(results.items()):
+                writer.writerow([url, status, (stored.get(url) or {}).get('status', '')])
+        print(f"Wrote {len(results)} results to {args.output}")
+    return EXIT_OK
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='cli.py', description='LinkedIn connection automation, batch mode')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='Log in and process a CSV of profiles')
+    run.add_argument('--csv', required=True, help='CSV file with a Profile_URL column')
+    run.add_argument('--account', required=True, help='LinkedIn username; also selects the state store')
+    run.add_argument('--mode', choices=RUN_MODES, default=MODE_PIPELINE)
+    note = run.add_mutually_exclusive_group()
+    note.add_argument('--note', help='Invitation note text')
+    note.add_argument('--note-file', help='Read the invitation note from this file')
+    run.add_argument('--note-policy', choices=NOTE_POLICIES, default=NOTE_IF_FITS)
+    run.add_argument('--order', choices=[ORDER_STALENESS, ORDER_CSV], default=ORDER_STALENESS,
+                     help='Visit never-seen and stalest profiles first, or keep CSV order')
+    run.add_argument('--concurrency', type=int, default=1,
+                     help='Browsers scanning in parallel during the two_phase pre-scan')
+    run.add_argument('--max-rate', type=float, help='Ceiling on profile loads per second, across all browsers')
+    run.add_argument('--resume', action='store_true', help='Continue from the checkpoint of an interrupted run')
+    run.add_argument('--lean', action='store_true', help='Block images, fonts and trackers')
+    run.add_argument('--headed', action='store_true', help='Show the browser window (needs a display)')
+    run.add_argument('--driver-path', help='chromedriver to use instead of the cached/downloaded one')
+    run.add_argument('--output', help='Metrics file (.prom, or .csv for CSV); default run_metrics.prom')
+    run.add_argument('--log-json', action='store_true', help='Write the log file as JSON lines')
+    run.add_argument('--capture-snapshots', action='store_true',
+                     help='Store each loaded profile page for offline re-classification')
+    run.set_defaults(func=run_command)
+
+    dry_run = commands.add_parser('dry-run', help='Show what a run would visit, without a browser')
+    dry_run.add_argument('--csv', required=True)
+    dry_run.add_argument('--account', help='Filter against this account\'s state store')
+    dry_run.add_argument('--mode', choices=RUN_MODES, default=MODE_PIPELINE)
+    dry_run.add_argument('--order', choices=[ORDER_STALENESS, ORDER_CSV], default=ORDER_STALENESS)
+    dry_run.add_argument('--show', type=int, default=10, help='Print the first N queued profiles')
+    dry_run.set_defaults(func=dry_run_command)
+
+    report = commands.add_parser('report', help='Summarise an account\'s state store')
+    report.add_argument('--account', required=True)
+    report.add_argument('--csv', help='Also show the checkpoint of this CSV')
+    report.add_argument('--output', help='Export every processed profile to this CSV file')
+    report.set_defaults(func=report_command)
+
+    classify = commands.add_parser('classify', help='Re-run profile detection on captured snapshots, offline')
+    classify.add_argument('--account', required=True)
+    classify.add_argument('--workers', type=int, help='Worker processes (default: one per core)')
+    classify.add_argument('--prune', action='store_true', help='Delete expired snapshots first')
+    classify.add_argument('--output', help='Write url, offline and stored status to this CSV file')
+    classify.set_defaults(func=classify_command)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, 'csv', None) and args.command != 'report' and not os.path.isfile(args.csv):
+        parser.error(f"CSV file not found: {args.csv}")
+    if args.command == 'run':
+        if args.concurrency < 1:
+            parser.error("--concurrency must be at least 1")
+        if args.concurrency > 1 and args.mode != MODE_TWO_PHASE:
+            parser.error("--concurrency only applies to the two_phase pre-scan")
+        if args.max_rate is not None and args.max_rate <= 0:
+            parser.error("--max-rate must be positive")
+        if args.headed and not has_display():
+            parser.error("--headed needs a display (DISPLAY/WAYLAND_DISPLAY is not set)")
+    sys.exit(args.func(args))
+
+
+if __name__ == '__main__':
+    main()
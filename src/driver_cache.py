@@ -0,0 +1,112 @@
+import json
+import logging
+import os
+import re
+import subprocess
+import sys
+import time
+
+# Explicit chromedriver path, skips version detection and the cache entirely
+CHROMEDRIVER_ENV = 'CHROMEDRIVER_PATH'
+DRIVER_CACHE_FILE = os.path.join(os.path.expanduser('~'), '.linkedin_bot', 'driver_cache.json')
+
+CHROME_VERSION_COMMANDS = [
+    ['google-chrome', '--version'],
+    ['google-chrome-stable', '--version'],
+    ['chromium', '--version'],
+    ['chromium-browser', '--version'],
+    ['/Applications/Google Chrome.app/Contents/MacOS/Google Chrome', '--version'],
+]
+VERSION_PATTERN = re.compile(r'(\d+\.\d+\.\d+\.\d+)')
+
+
+def detect_chrome_version():
+    """Return the installed Chrome version string without touching the network, or None"""
+    if sys.platform.startswith('win'):
+        try:
+            import winreg
+            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, r'Software\Google\Chrome\BLBeacon') as key:
+                return winreg.QueryValueEx(key, 'version')[0]
+        except OSError:
+            return None
+    for command in CHROME_VERSION_COMMANDS:
+        try:
+            output = subprocess.run(command, capture_output=True, text=True, timeout=5).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        match = VERSION_PATTERN.search(output)
+        if match:
+            return match.group(1)
+    return None
+
+
+class DriverCache:
+    """Maps installed Chrome versions to chromedriver paths resolved on earlier runs"""
+
+    def __init__(self, path=DRIVER_CACHE_FILE, logger=None):
+        self.path = path
+        self.logger = logger or logging.getLogger(__name__)
+
+    def load(self):
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, chrome_version):
+        driver_path = self.load().get(chrome_version)
+        if driver_path and os.path.exists(driver_path):
+            return driver_path
+        return None
+
+    def latest(self):
+        """Most recently stored driver that still exists, used when resolution fails offline"""
+        for driver_path in reversed(list(self.load().values())):
+            if os.path.exists(driver_path):
+                return driver_path
+        return None
+
+    def put(self, chrome_version, driver_path):
+        data = self.load()
+        data.pop(chrome_version, None)
+        data[chrome_version] = driver_path
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f'{self.path}.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            self.logger.warning(f"Could not update driver cache {self.path}: {str(e)}")
+
+
+def resolve_chromedriver(driver_path=None, cache=None, logger=None):
+    """Return (driver_path, source), hitting the network only when nothing local matches"""
+    logger = logger or logging.getLogger(__name__)
+    if driver_path:
+        return driver_path, 'argument'
+    if os.environ.get(CHROMEDRIVER_ENV):
+        return os.environ[CHROMEDRIVER_ENV], 'environment'
+
+    cache = cache or DriverCache(logger=logger)
+    start = time.perf_counter()
+    chrome_version = detect_chrome_version()
+    logger.info(f"Detected Chrome version {chrome_version} in {time.perf_counter() - start:.3f}s")
+    if chrome_version:
+        cached_path = cache.get(chrome_version)
+        if cached_path:
+            return cached_path, 'cache'
+
+    try:
+        from webdriver_manager.chrome import ChromeDriverManager
+        installed_path = ChromeDriverManager().install()
+    except Exception as e:
+        fallback_path = cache.latest()
+        if fallback_path is None:
+            raise
+        logger.warning(f"Driver download failed ({str(e)}), falling back to cached driver {fallback_path}")
+        return fallback_path, 'stale-cache'
+    if chrome_version:
+        cache.put(chrome_version, installed_path)
+    return installed_path, 'webdriver-manager'
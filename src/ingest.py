@@ -0,0 +1,123 @@
+import csv
+import logging
+from datetime import datetime
+from urllib.parse import quote, urlsplit, urlunsplit, unquote
+
+from scheduler import RevalidationScheduler
+
+PROFILE_URL_COLUMN = 'Profile_URL'
+# Characters a path segment may hold unescaped (RFC 3986 pchar minus unreserved); '/' is not one
+SEGMENT_SAFE = "!$&'()*+,;=:@"
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def canonicalize_url(url):
+    """Normalise a profile URL so trivially different spellings map to one key.
+
+    https://www.linkedin.com/in/<slug>/ with the slug lowercased, no query string or fragment.
+    Returns None for blank or unparsable values and for linkedin.com URLs that are not an
+    /in/<slug> profile.
+    """
+    url = (url or '').strip()
+    if not url:
+        return None
+    if '://' not in url:
+        url = f'https://{url}'
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return None
+    host = parts.hostname
+    if not host:
+        return None
+    host = host.lower()
+    segments = [segment for segment in parts.path.split('/') if segment]
+    if host == 'linkedin.com' or host.endswith('.linkedin.com'):
+        scheme, netloc = 'https', 'www.linkedin.com'
+        # Escapes are normalised per segment, so an encoded '/' (%2F) stays inside its segment
+        segments = [quote(unquote(segment).lower(), safe=SEGMENT_SAFE) for segment in segments]
+        if len(segments) < 2 or segments[0] != 'in':
+            return None
+    else:
+        # Other hosts (e.g. the local benchmark server) keep their scheme and port
+        scheme, netloc = parts.scheme.lower(), parts.netloc.lower()
+    path = '/' + '/'.join(segments) + '/'
+    return urlunsplit((scheme, netloc, path, '', ''))
+
+
+def iter_csv_chunks(csv_path, chunk_size=DEFAULT_CHUNK_SIZE, column=PROFILE_URL_COLUMN):
+    """Stream raw URL values from the CSV in lists of at most chunk_size"""
+    with open(csv_path, newline='', encoding='utf-8') as csvfile:
+        reader = csv.DictReader(csvfile)
+        if reader.fieldnames is None or column not in reader.fieldnames:
+            raise ValueError(f"CSV file {csv_path} has no '{column}' column")
+        chunk = []
+        for row in reader:
+            chunk.append(row[column])
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+class IngestStats:
+    def __init__(self):
+        self.total = 0
+        self.invalid = 0
+        self.duplicates = 0
+        self.skipped = 0
+        self.resumed_past = 0
+        self.queued = 0
+
+    def __str__(self):
+        return (f"rows: {self.total}, invalid: {self.invalid}, duplicates: {self.duplicates}, "
+                f"not due: {self.skipped}, before checkpoint: {self.resumed_past}, queued: {self.queued}")
+
+
+def ingest_profiles(csv_path, state_store=None, scheduler=None, phase=None,
+                    chunk_size=DEFAULT_CHUNK_SIZE, logger=None, start_row=0):
+    """Canonicalise, dedupe and pre-filter the CSV before the browser sees it.
+
+    Returns (queue, stats) where queue is the list of (row_number, canonical URL) pairs that are
+    due according to the scheduler, in the scheduler's visiting order. Rows numbered start_row
+    or lower (1-based, a resume checkpoint) are only used for de-duplication.
+    """
+    logger = logger or logging.getLogger(__name__)
+    scheduler = scheduler or RevalidationScheduler()
+    now = datetime.now()
+    stats = IngestStats()
+    seen = set()
+    entries = []
+    for chunk in iter_csv_chunks(csv_path, chunk_size):
+        fresh = []
+        for raw_url in chunk:
+            stats.total += 1
+            url = canonicalize_url(raw_url)
+            if url is None:
+                stats.invalid += 1
+                continue
+            if url in seen:
+                stats.duplicates += 1
+                continue
+            seen.add(url)
+            if stats.total <= start_row:
+                stats.resumed_past += 1
+                continue
+            fresh.append((stats.total, url, raw_url.strip()))
+
+        records = {}
+        if state_store is not None and fresh:
+            # Rows written before canonicalisation are keyed on the raw CSV value
+            records = state_store.get_records([u for _, url, raw_url in fresh for u in (url, raw_url)])
+        for row_number, url, raw_url in fresh:
+            record = records.get(url) or records.get(raw_url)
+            if not scheduler.is_due(record, phase, now):
+                stats.skipped += 1
+                continue
+            entries.append((scheduler.sort_key(record, row_number), row_number, url))
+    entries.sort()
+    queue = [(row_number, url) for _, row_number, url in entries]
+    stats.queued = len(queue)
+    logger.info(f"Ingested {csv_path}: {stats}")
+    return queue, stats
@@ -1,127 +1,291 @@
+import copy
 import logging
-import json
-from datetime import datetime
 import os
+import threading
 import time
-import csv
+from queue import Empty, Queue
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
-# XPaths used
-XPATHS = {
-        'send_note_button': "//button[contains(@aria-label, 'Add a note')]",
-        'send_without_note_button': "//button[contains(@aria-label, 'Send without a note')]",
-        'connect_to_invite': "(//main//button[contains(@aria-label, 'Invite')])[1]",
-        'note_text_box': "//textarea[contains(@name, 'message')]",
-        'send_invitation_confirmation_button': "//button[contains(@aria-label, 'Send invitation')]",
-        'more_options': "//main//button[contains(@aria-label, 'More actions')]",
-        'invite_options': "//main//div[contains(@aria-label, 'to connect')]",
-        'message_option': "//span[text()='1st']",
-        'already_connected_indicator': "//span[text()='1st']"
-    }
+from browser_watchdog import BrowserWatchdog
+from driver_cache import resolve_chromedriver
+from ingest import ingest_profiles
+from locators import LocatorEngine, classify_profile, LOCATOR_STATS_FILE, LOCATORS, PROFILE_PROBE_KEYS
+from metrics import RunMetrics, timed
+from parallel_scan import CompletionWatermark, StoreWriter
+from progress import ProgressTracker, RunControl
+from rate_limit import TokenBucket
+from recovery import CircuitBreaker, RetryPolicy, classify_failure, FATAL, PAGE_SHAPE, SESSION_LOST
+from run_options import (MODE_PIPELINE, MODE_TWO_PHASE, NOTE_ALWAYS, NOTE_ASK, NOTE_IF_FITS, NOTE_MAX_LENGTH,
+                         NOTE_NEVER, NOTE_POLICIES)
+from scheduler import RevalidationScheduler, ORDER_STALENESS
+from session import SessionManager
+from snapshots import SnapshotStore, snapshot_store_filename
+from state_store import ProcessedUrlStore, state_store_filename
+from utils import setup_logging
+from waits import StepWaiter
+
+LINKEDIN_URL = "https://www.linkedin.com"
+LOGIN_PATH = "/login"
+FEED_PATH = "/feed/"
+
+METRICS_FILE = 'run_metrics.prom'
+
+# URL patterns blocked in lean mode: images, fonts, media and third-party trackers
+LEAN_BLOCKED_URL_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf',
+    '*.mp4', '*.webm', '*.mp3', '*.m3u8',
+    '*media.licdn.com*', '*static.licdn.com/aero-v1/sc/h/*.svg',
+    '*px.ads.linkedin.com*', '*snap.licdn.com*', '*doubleclick.net*',
+    '*google-analytics.com*', '*googletagmanager.com*', '*bat.bing.com*',
+]
+
+
 class LinkedInBot:
 
     
-    def __init__(self):
-        self.logger = self.setup_logging()
+    def __init__(self, wait_timeouts=None, persist_session=True, log_json=False, base_url=LINKEDIN_URL,
+                 metrics_path=METRICS_FILE, note_policy=NOTE_IF_FITS, otp_callback=None,
+                 status_ttls=None, queue_order=ORDER_STALENESS, watchdog=None,
+                 locator_stats_path=LOCATOR_STATS_FILE, capture_snapshots=False, scan_workers=1, max_rate=None,
+                 driver_factory=None):
+        if note_policy not in NOTE_POLICIES:
+            raise ValueError(f"Unknown note policy: {note_policy}")
+        self.logger = self.setup_logging(log_json)
+        self.base_url = base_url.rstrip('/')
         self.browser = None
+        self.state_store = None
+        self.snapshot_store = None
+        self.capture_snapshots = capture_snapshots
+        self.metrics = RunMetrics()
+        self.metrics_path = metrics_path
+        self.progress = ProgressTracker()
+        self.run_control = RunControl()
+        self.scheduler = RevalidationScheduler(status_ttls, queue_order)
+        self.retry_policy = RetryPolicy()
+        self.circuit_breaker = CircuitBreaker()
+        self.watchdog = watchdog or BrowserWatchdog()
+        self.browser_options = {}
+        # Stand-in for Chrome (e.g. the benchmarks' SimulatedDriver): called with no arguments per launch
+        self.driver_factory = driver_factory
+        self.credentials = None
+        # Set when a lost session could not be restored yet; the next attempt restarts the browser first
+        self.browser_lost = False
+        # Pre-scan browsers; extra ones are workers sharing this browser's login through session_cookies
+        self.scan_workers = scan_workers
+        self.session_cookies = None
+        # Profile loads per second across every browser of the run
+        self.rate_limiter = TokenBucket(max_rate) if max_rate else None
+        self.note_policy = note_policy
+        self.otp_callback = otp_callback
+        self.locators = LocatorEngine(LOCATORS, locator_stats_path, self.logger)
+        self.waiter = StepWaiter(wait_timeouts, self.logger, metrics=self.metrics, locators=self.locators)
+        self.persist_session = persist_session
+        self.session = SessionManager(logger=self.logger)
 
-    def setup_logging(self):
-        log_format = '%(asctime)s - %(levelname)s - %(message)s'
-        logging.basicConfig(
-            level=logging.INFO,
-            format=log_format,
-            handlers=[
-                logging.FileHandler('linkedin_automation.log'),
-                logging.StreamHandler()
-            ]
-        )
+    def setup_logging(self, log_json=False):
+        setup_logging(json_lines=log_json)
         return logging.getLogger(__name__)
 
-    def setup_browser(self, headless=False):
-        """Initialize the WebDriver with Chrome options"""
-        self.logger.info("Setting up Chrome browser...")
+    def setup_browser(self, headless=False, driver_path=None, username=None, lean=False):
+        """Initialize the WebDriver with Chrome options.
+
+        lean uses the 'eager' page-load strategy and blocks images, fonts, media and trackers.
+        """
+        self.browser_options = {'headless': headless, 'driver_path': driver_path, 'username': username, 'lean': lean}
+        if self.driver_factory is not None:
+            self.browser = self.driver_factory()
+            self.watchdog.reset()
+            self.logger.info(f"Using {type(self.browser).__name__} instead of Chrome")
+            return self.browser
+        self.logger.info(f"Setting up Chrome browser (headless={headless}, lean={lean})...")
         try:
+            start = time.perf_counter()
             options = Options()
             options.add_argument("--disable-gpu")
-            options.add_argument("--start-maximized")
+            if headless:
+                options.add_argument("--headless=new")
+                options.add_argument("--window-size=1920,1080")
+            else:
+                options.add_argument("--start-maximized")
+            if lean:
+                options.page_load_strategy = 'eager'
+                options.add_argument("--blink-settings=imagesEnabled=false")
+                options.add_experimental_option('prefs', {
+                    'profile.managed_default_content_settings.images': 2,
+                })
             options.add_experimental_option('excludeSwitches', ['enable-logging'])
-            service = Service(ChromeDriverManager().install())
+            if self.persist_session and username:
+                options.add_argument(f"--user-data-dir={self.session.profile_dir(username)}")
+            driver_path, source = resolve_chromedriver(driver_path, logger=self.logger)
+            resolved = time.perf_counter()
+            service = Service(driver_path)
             self.browser = webdriver.Chrome(service=service, options=options)
-            self.logger.info("Chrome browser setup successful")
+            self.watchdog.reset()
+            if lean:
+                self.block_resources()
+            launched = time.perf_counter()
+            self.logger.info(
+                f"Chrome browser setup successful (driver from {source}: {resolved - start:.2f}s, "
+                f"browser launch: {launched - resolved:.2f}s, total: {launched - start:.2f}s)"
+            )
             return self.browser
         except Exception as e:
             self.logger.error(f"Failed to setup browser: {str(e)}")
             raise
 
+    def block_resources(self):
+        """Block heavy resources and trackers through CDP; the bot only reads a few buttons and spans"""
+        try:
+            self.browser.execute_cdp_cmd('Network.enable', {})
+            self.browser.execute_cdp_cmd('Network.setBlockedURLs', {'urls': LEAN_BLOCKED_URL_PATTERNS})
+            self.logger.info(f"Blocking {len(LEAN_BLOCKED_URL_PATTERNS)} resource URL patterns")
+        except WebDriverException as e:
+            self.logger.warning(f"Could not enable resource blocking: {str(e)}")
+
     def get_processed_urls_filename(self, username):
-        """Generate a unique processed URLs filename for each account"""
+        """Legacy JSON processed URLs filename, only read by the one-time importer"""
         safe_username = "".join(x for x in username if x.isalnum())
         return f'processed_urls_{safe_username}.json'
 
+    def get_state_store_filename(self, username):
+        """Generate the state store filename for an account"""
+        return state_store_filename(username)
+
+    def open_state_store(self, username):
+        """Open (once per run) the processed URLs store for an account"""
+        filename = self.get_state_store_filename(username)
+        if self.state_store is not None:
+            if self.state_store.path == filename:
+                return self.state_store
+            self.close_state_store()
+        self.state_store = ProcessedUrlStore(filename, self.logger).open()
+        self.state_store.import_json(self.get_processed_urls_filename(username))
+        return self.state_store
+
+    def close_state_store(self):
+        if self.state_store is not None:
+            self.state_store.close()
+            self.state_store = None
+        if self.snapshot_store is not None:
+            self.snapshot_store.close()
+            self.snapshot_store = None
+
+    def open_snapshot_store(self, username):
+        filename = snapshot_store_filename(username)
+        if self.snapshot_store is None or self.snapshot_store.path != filename:
+            if self.snapshot_store is not None:
+                self.snapshot_store.close()
+            self.snapshot_store = SnapshotStore(filename, logger=self.logger).open()
+        return self.snapshot_store
+
+    @timed('snapshot')
+    def capture_snapshot(self, profile_url, username):
+        """Store the loaded profile's page source for offline re-classification; never fails the profile"""
+        try:
+            size = self.open_snapshot_store(username).put(profile_url, self.browser.page_source)
+            self.logger.debug("Captured snapshot of %s (%d bytes compressed)", profile_url, size)
+        except Exception as e:
+            self.logger.warning(f"Could not capture snapshot of {profile_url}: {str(e)}")
+
     def load_processed_urls(self, username):
         self.logger.info(f"Loading previously processed URLs for account: {username}")
-        filename = self.get_processed_urls_filename(username)
         try:
-            if os.path.exists(filename):
-                with open(filename, 'r') as f:
-                    data = json.load(f)
-                    self.logger.info(f"Loaded {len(data)} previously processed URLs for {username}")
-                    return data
-            else:
-                return {}
+            data = self.open_state_store(username).load_all()
+            self.logger.info(f"Loaded {len(data)} previously processed URLs for {username}")
+            return data
         except Exception as e:
             self.logger.error(f"Error loading processed URLs for {username}: {str(e)}")
-        self.logger.info(f"No previous processed URLs found for {username}, starting fresh")
         return {}
 
+    @timed('save_processed_url')
     def save_processed_url(self, url, status, username):
-        self.logger.debug(f"Saving URL status for {username} - URL: {url}, Status: {status}")
+        self.logger.debug("Saving URL status for %s - URL: %s, Status: %s", username, url, status)
         try:
-            filename = self.get_processed_urls_filename(username)
-            processed_urls = self.load_processed_urls(username)
-            processed_urls[url] = {
-                'status': status,
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            }
-            with open(filename, 'w') as f:
-                json.dump(processed_urls, f)
-            self.logger.info(f"Successfully saved status for URL: {url} for account: {username}")
+            self.open_state_store(username).upsert(url, status)
+            self.logger.info("Successfully saved status for URL: %s for account: %s", url, username,
+                             extra={'profile_url': url, 'status': status})
         except Exception as e:
             self.logger.error(f"Error saving processed URL {url} for {username}: {str(e)}")
 
-    def is_already_connected(self):
+    @timed('probe')
+    def probe_elements(self, keys):
+        """Look up the given LOCATORS entries in one execute_script call.
+
+        Returns {key: {'present': bool, 'visible': bool, 'element': WebElement or None}}.
+        """
+        self.logger.debug("Probing elements: %s", keys)
+        return self.locators.probe(self.browser, keys)
+
+    @timed('is_already_connected')
+    def is_already_connected(self, probe=None):
         self.logger.debug("Checking if already connected...")
         try:
-            element = self.safe_find_element(By.XPATH, XPATHS['already_connected_indicator'])
-            is_connected = element is not None and element.is_displayed()
-            self.logger.info(f"Connection status check result: {'Connected' if is_connected else 'Not connected'}")
+            if probe is None:
+                probe = self.probe_elements(['already_connected_indicator'])
+            is_connected = probe['already_connected_indicator']['visible']
+            self.logger.info("Connection status check result: %s", 'Connected' if is_connected else 'Not connected')
             return is_connected
         except Exception as e:
             self.logger.error(f"Error checking connection status: {str(e)}")
             return False
 
+    @timed('safe_find_element')
     def safe_find_element(self, by, value):
-        self.logger.debug(f"Searching for element: {by}={value}")
+        self.logger.debug("Searching for element: %s=%s", by, value)
         try:
             element = self.browser.find_element(by, value)
-            self.logger.debug(f"Element found: {by}={value}")
+            self.logger.debug("Element found: %s=%s", by, value)
             return element
         except NoSuchElementException:
-            self.logger.debug(f"Element not found: {by}={value}")
+            self.logger.debug("Element not found: %s=%s", by, value)
             return None
 
+    def is_authenticated(self):
+        """Fast check whether the browser session is already logged in"""
+        self.browser.get(f"{self.base_url}{FEED_PATH}")
+        element = self.waiter.wait(self.browser, 'session_probe', EC.any_of(
+            EC.presence_of_element_located((By.ID, "global-nav-search")),
+            EC.presence_of_element_located((By.ID, "username")),
+        ))
+        authenticated = element is not None and element.get_attribute('id') == "global-nav-search"
+        self.logger.info(f"Session probe result: {'authenticated' if authenticated else 'not authenticated'}")
+        return authenticated
+
+    def restore_session(self, username):
+        """Reuse the persisted profile or cookie snapshot; returns True if no form login is needed"""
+        if self.is_authenticated():
+            self.logger.info("Existing session is still valid, skipping login form")
+            return True
+        if self.session.has_cookies(username):
+            self.session.restore_cookies(self.browser, username)
+            if self.is_authenticated():
+                self.logger.info("Session restored from cookie snapshot, skipping login form")
+                return True
+            self.session.clear(username)
+        return False
+
+    def request_otp(self):
+        """Get the OTP from otp_callback (e.g. a Qt dialog), falling back to the console"""
+        if self.otp_callback is not None:
+            return self.otp_callback()
+        return input("Enter the OTP sent to your phone: ")
+
     def login_to_linkedin(self, username, password):
         self.logger.info("Starting LinkedIn login process...")
+        self.credentials = (username, password)
         try:
-            self.browser.get("https://www.linkedin.com/login")
+            if self.persist_session and self.restore_session(username):
+                return True
+
+            self.browser.get(f"{self.base_url}{LOGIN_PATH}")
             self.logger.info("Navigated to LinkedIn login page")
             
             wait = WebDriverWait(self.browser, 10)
@@ -143,18 +307,30 @@ class LinkedInBot:
                     self.logger.error("Sign in button not found, cannot proceed with login.")
                     return False
                 
-                try:
-                    otp_element = WebDriverWait(self.browser, 10).until(EC.presence_of_element_located((By.ID, "input__phone_verification_pin")))
-                    otp_code = input("Enter the OTP sent to your phone: ")
-                    otp_element.send_keys(otp_code)
+                # Wait for whichever comes first instead of always sitting out the OTP timeout
+                result = self.waiter.wait(self.browser, 'login_result', EC.any_of(
+                    EC.presence_of_element_located((By.ID, "global-nav-search")),
+                    EC.presence_of_element_located((By.ID, "input__phone_verification_pin")),
+                ))
+                if result is None:
+                    raise TimeoutException()
+                if result.get_attribute('id') == "input__phone_verification_pin":
+                    otp_code = self.request_otp()
+                    if not otp_code:
+                        self.logger.error("Login failed: no OTP provided.")
+                        return False
+                    result.send_keys(otp_code)
                     self.browser.find_element(By.XPATH, "//button[@type='submit']").click()
                     self.logger.info("Entered OTP and submitted.")
-                except TimeoutException:
+                    # Verify successful login
+                    if not self.waiter.wait(self.browser, 'login_result', EC.presence_of_element_located((By.ID, "global-nav-search"))):
+                        raise TimeoutException()
+                else:
                     self.logger.info("No OTP verification required.")
-            
-                # Verify successful login
-                WebDriverWait(self.browser, 120).until(EC.presence_of_element_located((By.ID, "global-nav-search")))
+
                 self.logger.info("Logged in to LinkedIn successfully.")
+                if self.persist_session:
+                    self.session.save_cookies(self.browser, username)
                 return True
         except TimeoutException:
             self.logger.error("Login failed: Timeout while waiting for elements.")
@@ -166,39 +342,46 @@ class LinkedInBot:
             self.logger.error(f"Login failed: {str(e)}")
             return False
 
+    @timed('send_invitation')
     def send_invitation(self, note, with_note=True):
         self.logger.info("Attempting to send invitation...")
         if with_note:
             self.logger.info("Sending invitation with note")
-            send_note = self.safe_find_element(By.XPATH, XPATHS['send_note_button'])
+            send_note = self.waiter.for_element(self.browser, 'invite_modal', 'send_note_button', clickable=True)
             if send_note:
                 try:
-                    send_note.click()
+                    with self.metrics.span('click'):
+                        send_note.click()
                     self.logger.info("Clicked 'Add a note' button")
-                    time.sleep(2)
                     
-                    note_box = self.safe_find_element(By.XPATH, XPATHS['note_text_box'])
+                    note_box = self.waiter.for_element(self.browser, 'note_text_box', 'note_text_box')
                     if note_box:
                         note_box.send_keys(note)
                         self.logger.info("Note text entered successfully")
-                        time.sleep(2)
                         
-                        confirm_button = self.safe_find_element(By.XPATH, XPATHS['send_invitation_confirmation_button'])
+                        confirm_button = self.waiter.for_element(
+                            self.browser, 'send_invitation_confirmation',
+                            'send_invitation_confirmation_button', clickable=True
+                        )
                         if confirm_button:
-                            confirm_button.click()
+                            with self.metrics.span('click'):
+                                confirm_button.click()
+                            self.waiter.until_gone(self.browser, 'invitation_sent', 'send_invitation_confirmation_button')
                             self.logger.info("Invitation with note sent successfully")
-                            time.sleep(2)
                             return True
                 except Exception as e:
                     self.logger.error(f"Error sending invitation with note: {str(e)}")
         else:
             self.logger.info("Sending invitation without note")
-            send_without_note = self.safe_find_element(By.XPATH, XPATHS['send_without_note_button'])
+            send_without_note = self.waiter.for_element(
+                self.browser, 'invite_modal', 'send_without_note_button', clickable=True
+            )
             if send_without_note:
                 try:
-                    send_without_note.click()
+                    with self.metrics.span('click'):
+                        send_without_note.click()
+                    self.waiter.until_gone(self.browser, 'invitation_sent', 'send_without_note_button')
                     self.logger.info("Invitation without note sent successfully")
-                    time.sleep(2)
                     return True
                 except Exception as e:
                     self.logger.error(f"Error sending invitation without note: {str(e)}")
@@ -206,124 +389,464 @@ class LinkedInBot:
         self.logger.error("Failed to send invitation")
         return False
 
-    def pre_scan_profiles(self, csv_path, username):
-        """Pre-scan profiles from CSV to determine connection status"""
+    def open_profile(self, profile_url):
+        """Navigate to a profile and wait until the elements the connect step reads are present"""
+        if self.rate_limiter is not None:
+            waited = self.rate_limiter.acquire()
+            if waited:
+                self.metrics.record('rate_limit', waited)
+        with self.metrics.span('navigate'):
+            self.browser.get(profile_url)
+        loaded = self.waiter.for_any(self.browser, 'profile_load', PROFILE_PROBE_KEYS)
+        if not loaded:
+            self.logger.warning(f"Profile actions did not appear within timeout: {profile_url}")
+
+    def ingest(self, csv_path, username, phase, start_row=0):
+        """Canonicalise, dedupe and keep only the profiles the scheduler says are due"""
+        if not self.scheduler.preserves_csv_order:
+            # Out of CSV order a row checkpoint is not a prefix; finished profiles are simply not due
+            start_row = 0
+        return ingest_profiles(csv_path, self.open_state_store(username), self.scheduler, phase,
+                               logger=self.logger, start_row=start_row)
+
+    def get_checkpoint_key(self, csv_path):
+        return os.path.abspath(csv_path)
+
+    def save_checkpoint(self, csv_path, username, mode, phase, row_number):
+        self.open_state_store(username).save_checkpoint(
+            self.get_checkpoint_key(csv_path), mode, phase, row_number, dict(self.progress.status_counts)
+        )
+
+    def should_continue(self):
+        """Checked between profiles: waits while paused, False once cancelled"""
+        if self.run_control.paused:
+            self.logger.info("Run paused")
+        if not self.run_control.should_continue():
+            self.logger.info("Run cancelled, stopping at profile boundary")
+            return False
+        return True
+
+    def pre_scan_profiles(self, csv_path, username, start_row=0):
+        """Pre-scan profiles from CSV to determine connection status; returns True if it ran to the end"""
+        if self.scan_workers > 1:
+            return self.parallel_pre_scan(csv_path, username, start_row)
         self.logger.info("Starting pre-scan of profiles...")
         try:
-            processed_urls = self.load_processed_urls(username)
-            total_profiles = 0
+            queue, stats = self.ingest(csv_path, username, 'pre_scan', start_row)
+            self.progress.start('pre_scan', len(queue), stats.total - len(queue))
             already_connected_profiles = 0
-            new_profiles = 0
-            with open(csv_path, newline='', encoding='utf-8') as csvfile:
-                reader = csv.DictReader(csvfile)
-                for row in reader:
-                    profile_url = row['Profile_URL']
-                    total_profiles += 1
-                    if profile_url in processed_urls and processed_urls[profile_url]['status'] in ["Connected", "Already Connected"]:
-                        self.logger.info(f"Skipping already connected profile: {profile_url}")
-                        already_connected_profiles += 1
-                        continue
-                    
-                    self.logger.info(f"Scanning profile {total_profiles}: {profile_url}")
-                    new_profiles += 1
-                    
-                    self.browser.get(profile_url)
-                    time.sleep(3)
-                    
-                    if self.is_already_connected():
-                        self.logger.info(f"Profile already connected: {profile_url}")
-                        self.save_processed_url(profile_url, "Already Connected", username)
-                        already_connected_profiles += 1
-                    else:
-                        self.logger.info(f"Profile not connected: {profile_url}")
-                        self.save_processed_url(profile_url, "Not Connected", username)
+            for index, (row_number, profile_url) in enumerate(queue, 1):
+                if not self.should_continue() or not self.wait_for_circuit():
+                    return False
+                self.logger.info("Scanning profile %d/%d: %s", index, len(queue), profile_url)
+                status = self.with_recovery(profile_url, lambda: self.scan_profile(profile_url, username))
+                if status == "Already Connected":
+                    already_connected_profiles += 1
+                self.save_checkpoint(csv_path, username, MODE_TWO_PHASE, 'pre_scan', row_number)
+                self.maybe_recycle_browser()
             
-            self.logger.info(f"Pre-scan completed. Total profiles: {total_profiles}, Already connected: {already_connected_profiles}, New profiles: {new_profiles}")
+            self.logger.info(f"Pre-scan completed. Total profiles: {stats.total}, Not due: {stats.skipped}, Scanned: {len(queue)}, Already connected: {already_connected_profiles}")
+            self.save_checkpoint(csv_path, username, MODE_TWO_PHASE, 'connect', 0)
+            return True
         except Exception as e:
             self.logger.error(f"Error in pre_scan_profiles: {str(e)}")
+            return False
+
+    def scan_profile(self, profile_url, username, save=None):
+        """Load a profile and record whether it is already connected, through save (default: the state store)"""
+        start = time.perf_counter()
+        self.open_profile(profile_url)
+        loaded = time.perf_counter()
+        if self.capture_snapshots:
+            self.capture_snapshot(profile_url, username)
 
-    def connect_with_remaining(self, csv_path, note, username):
-        """Connect with remaining profiles from CSV"""
+        if self.is_already_connected():
+            self.logger.info("Profile already connected: %s", profile_url)
+            status = "Already Connected"
+        else:
+            self.logger.info("Profile not connected: %s", profile_url)
+            status = "Not Connected"
+        (save or self.save_processed_url)(profile_url, status, username)
+        self.log_profile_result(profile_url, status, {'load': loaded - start, 'classify': time.perf_counter() - loaded})
+        return status
+
+    def with_recovery(self, profile_url, work):
+        """Run one profile's work with retries, browser restarts and the circuit breaker.
+
+        Returns work()'s result, or None once the profile is given up on. Fatal errors propagate.
+        """
+        for attempt in range(1, self.retry_policy.max_attempts + 1):
+            restarting = self.browser_lost
+            try:
+                if restarting:
+                    self.restart_browser()
+                    self.browser_lost = False
+                    restarting = False
+                result = work()
+                self.circuit_breaker.record(True)
+                return result
+            except Exception as e:
+                # A failed restart is a failed attempt whatever it raised; the next one restarts again
+                kind = SESSION_LOST if restarting else classify_failure(e)
+                self.metrics.increment(f'failure:{kind}')
+                step = "Browser restart" if restarting else f"Attempt {attempt}"
+                self.logger.warning(f"{step} for {profile_url} failed ({kind}): {str(e).splitlines()[0] if str(e) else type(e).__name__}")
+                if kind == FATAL:
+                    raise
+                if kind == PAGE_SHAPE:
+                    break
+                if kind == SESSION_LOST:
+                    self.browser_lost = True
+                if attempt < self.retry_policy.max_attempts:
+                    delay = self.retry_policy.delay(attempt)
+                    self.logger.info(f"Retrying {profile_url} in {delay:.1f}s")
+                    if self.run_control.cancelled_event.wait(delay):
+                        break
+        self.circuit_breaker.record(False)
+        self.logger.error(f"Giving up on {profile_url} for this run")
+        self.log_profile_result(profile_url, None, {})
+        return None
+
+    def wait_for_circuit(self):
+        """Pause the run while the circuit breaker is open; False if cancelled meanwhile"""
+        if not self.circuit_breaker.is_open:
+            return True
+        cooldown = self.circuit_breaker.remaining_cooldown()
+        self.logger.warning(f"Failure rate {self.circuit_breaker.failure_rate():.0%} over the last "
+                            f"{len(self.circuit_breaker.results)} profiles, pausing for {cooldown:.0f}s")
+        if self.run_control.cancelled_event.wait(cooldown):
+            return False
+        self.circuit_breaker.half_open()
+        return True
+
+    def restart_browser(self):
+        """Replace a dead driver session with a new browser and restore the login"""
+        self.logger.warning("Browser session lost, restarting browser...")
+        self.metrics.increment('browser_restart')
+        self.relaunch_browser()
+
+    def maybe_recycle_browser(self):
+        """At a profile boundary, recycle the browser if the watchdog says it has grown too much"""
+        pid = self.browser_pid()
+        reason = self.watchdog.profile_done(pid)
+        if reason is None:
+            return
+        self.logger.info(f"Recycling browser: {reason}")
+        self.metrics.increment('browser_recycle')
+        cookies = None
+        if self.credentials and self.session_cookies is None:
+            # Carry the logged-in session over to the next browser instead of the login form
+            cookies = self.browser.get_cookies()
+            if self.persist_session:
+                self.session.save_cookies(self.browser, self.credentials[0])
+        self.relaunch_browser(cookies)
+
+    def browser_pid(self):
+        try:
+            return self.browser.service.process.pid
+        except AttributeError:
+            return None
+
+    def relaunch_browser(self, cookies=None):
+        """Replace the browser and log it in again, with the given cookies when there are some"""
+        try:
+            self.browser.quit()
+        except Exception as e:
+            self.logger.debug("Ignoring error while quitting browser: %s", e)
+        self.browser = None
+        self.setup_browser(**self.browser_options)
+        if self.session_cookies is not None:
+            if not self.adopt_session():
+                raise WebDriverException("Shared session cookies were rejected after browser relaunch")
+        elif cookies is not None and self.adopt_session(cookies):
+            return
+        elif self.credentials and not self.login_to_linkedin(*self.credentials):
+            raise WebDriverException("Could not restore login after browser relaunch")
+
+    def adopt_session(self, cookies=None):
+        """Log this browser in with a cookie snapshot (session_cookies by default) instead of the login form"""
+        self.browser.get(f"{self.base_url}/")
+        self.session.add_cookies(self.browser, cookies if cookies is not None else self.session_cookies)
+        return self.is_authenticated()
+
+    def spawn_worker(self, cookies):
+        """A copy of this bot driving its own isolated browser, logged in with the given cookies.
+
+        Metrics, progress, locators, run control, circuit breaker and rate limiter stay shared.
+        """
+        worker = copy.copy(self)
+        worker.browser = None
+        worker.session_cookies = cookies
+        worker.watchdog = BrowserWatchdog(self.watchdog.max_rss_mb, self.watchdog.max_profiles,
+                                          self.watchdog.sample_interval)
+        # No --user-data-dir: Chrome profiles cannot be shared between running browsers
+        worker.browser_options = dict(self.browser_options, username=None)
+        worker.setup_browser(**worker.browser_options)
+        if not worker.adopt_session():
+            worker.browser.quit()
+            raise WebDriverException("Worker browser did not accept the shared session cookies")
+        return worker
+
+    def parallel_pre_scan(self, csv_path, username, start_row=0):
+        """Pre-scan with scan_workers browsers fed from one queue; results go through a single store writer"""
+        self.logger.info(f"Starting parallel pre-scan of profiles with {self.scan_workers} browsers...")
+        if self.rate_limiter is None:
+            self.logger.warning("No rate limit set, every browser loads profiles as fast as it can")
+        try:
+            queue, stats = self.ingest(csv_path, username, 'pre_scan', start_row)
+            self.progress.start('pre_scan', len(queue), stats.total - len(queue))
+            work = Queue()
+            for item in queue:
+                work.put(item)
+            watermark = CompletionWatermark(row_number for row_number, _ in queue)
+            writer = StoreWriter(
+                self.open_state_store(username), logger=self.logger,
+                on_checkpoint=lambda row: self.save_checkpoint(csv_path, username, MODE_TWO_PHASE, 'pre_scan', row),
+            ).start()
+            if self.capture_snapshots:
+                # Opened once here so every worker copy shares one connection
+                self.open_snapshot_store(username)
+            cookies = self.browser.get_cookies()
+            stopped = threading.Event()
+            statuses = []
+
+            def scan_loop(index):
+                worker = self
+                item = None
+                try:
+                    if index:
+                        worker = self.spawn_worker(cookies)
+                    while not stopped.is_set():
+                        try:
+                            item = work.get_nowait()
+                        except Empty:
+                            return
+                        row_number, profile_url = item
+                        if not self.should_continue() or not self.wait_for_circuit():
+                            work.put(item)
+                            stopped.set()
+                            return
+                        statuses.append(worker.with_recovery(
+                            profile_url, lambda: worker.scan_profile(profile_url, username, save=writer.put)
+                        ))
+                        item = None
+                        moved = watermark.complete(row_number)
+                        if moved is not None:
+                            writer.checkpoint(moved)
+                        worker.maybe_recycle_browser()
+                except Exception as e:
+                    self.logger.error(f"Pre-scan worker {index} stopped: {str(e)}")
+                    if item is not None:
+                        # The unfinished profile holds the watermark back, so resume picks it up again
+                        work.put(item)
+                        stopped.set()
+                finally:
+                    if worker is not self and worker.browser is not None:
+                        try:
+                            worker.browser.quit()
+                        except Exception as e:
+                            self.logger.debug("Ignoring error while quitting worker browser: %s", e)
+
+            threads = [threading.Thread(target=scan_loop, args=(i,), name=f'pre-scan-{i}')
+                       for i in range(min(self.scan_workers, max(len(queue), 1)))]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            writer.close()
+
+            if stopped.is_set() or not work.empty():
+                return False
+            self.logger.info(f"Pre-scan completed. Total profiles: {stats.total}, Not due: {stats.skipped}, "
+                             f"Scanned: {len(queue)}, Already connected: {statuses.count('Already Connected')}")
+            self.save_checkpoint(csv_path, username, MODE_TWO_PHASE, 'connect', 0)
+            return True
+        except Exception as e:
+            self.logger.error(f"Error in parallel_pre_scan: {str(e)}")
+            return False
+
+    def should_send_note(self, note):
+        """Apply note_policy; only NOTE_ASK prompts on the console"""
+        if self.note_policy == NOTE_NEVER or not note.strip():
+            return False
+        if self.note_policy == NOTE_ALWAYS:
+            return True
+        if self.note_policy == NOTE_IF_FITS:
+            return len(note) <= NOTE_MAX_LENGTH
+        return input("Do you want to send the invitation with a note? (yes/no): ").strip().lower() == 'yes'
+
+    def connect_profile(self, profile_url, note, username):
+        """Run the connect step on the profile page that is already loaded; returns the saved status"""
+        probe = self.probe_elements(PROFILE_PROBE_KEYS)
+        status = classify_profile(probe)
+        if status == "Already Connected":
+            self.logger.info(f"Found already connected profile: {profile_url}")
+            self.save_processed_url(profile_url, "Already Connected", username)
+            return "Already Connected"
+
+        if status == "Not Connected":
+            self.logger.info("Found direct connect button")
+            with self.metrics.span('click'):
+                probe['connect_to_invite']['element'].click()
+            with_note = self.should_send_note(note)
+
+            if self.send_invitation(note, with_note):
+                self.save_processed_url(profile_url, "Connection Sent", username)
+                return "Connection Sent"
+            return None
+
+        self.logger.warning(f"No connect option found for {profile_url}")
+        self.save_processed_url(profile_url, "No Connect Option", username)
+        return "No Connect Option"
+
+    def visit_and_connect(self, profile_url, note, username):
+        """Load a profile and run the connect step on it, logging per-step durations"""
+        start = time.perf_counter()
+        self.open_profile(profile_url)
+        loaded = time.perf_counter()
+        if self.capture_snapshots:
+            self.capture_snapshot(profile_url, username)
+        status = self.connect_profile(profile_url, note, username)
+        self.log_profile_result(profile_url, status, {'load': loaded - start, 'connect': time.perf_counter() - loaded})
+        return status
+
+    def log_profile_result(self, profile_url, status, durations):
+        """One structured record per profile; the JSON-lines log carries url, status and durations"""
+        self.logger.info("Profile done: %s -> %s (%s)", profile_url, status,
+                         ', '.join(f"{step} {seconds:.2f}s" for step, seconds in durations.items()),
+                         extra={'profile_url': profile_url, 'status': status, 'durations': durations})
+        if durations:
+            self.metrics.record('profile', sum(durations.values()))
+        self.metrics.profile_done()
+        self.progress.update(status)
+
+    def connect_with_remaining(self, csv_path, note, username, start_row=0):
+        """Connect with remaining profiles from CSV; returns True if it ran to the end"""
         self.logger.info("Starting to connect with remaining profiles...")
         try:
-            processed_urls = self.load_processed_urls(username)
+            queue, stats = self.ingest(csv_path, username, 'connect', start_row)
+            self.progress.start('connect', len(queue), stats.total - len(queue))
             connection_attempts = 0
             successful_connections = 0
-            with open(csv_path, newline='', encoding='utf-8') as csvfile:
-                reader = csv.DictReader(csvfile)
-                for row in reader:
-                    profile_url = row['Profile_URL']
-                    if profile_url in processed_urls and processed_urls[profile_url]['status'] in ["Connected", "Already Connected"]:
-                        self.logger.info(f"Skipping already connected profile: {profile_url}")
-                        continue
-                    
-                    self.logger.info(f"Processing URL: {profile_url}")
-                    connection_attempts += 1
-                    
-                    self.browser.get(profile_url)
-                    time.sleep(3)
-                    
-                    if self.is_already_connected():
-                        self.logger.info(f"Found already connected profile: {profile_url}")
-                        self.save_processed_url(profile_url, "Already Connected", username)
-                        continue
-
-                    connect_button = self.safe_find_element(By.XPATH, XPATHS['connect_to_invite'])
-                    if connect_button and connect_button.is_displayed():
-                        self.logger.info("Found direct connect button")
-                        connect_button.click()
-                        time.sleep(2)
-                        # Ask user whether to send with or without note
-                        with_note = input("Do you want to send the invitation with a note? (yes/no): ").strip().lower() == 'yes'
-                        
-                        if self.send_invitation(note, with_note):
-                            self.save_processed_url(profile_url, "Connection Sent", username)
-                            successful_connections += 1
-                        continue
-                    else:
-                        self.logger.warning(f"No connect option found for {profile_url}")
-                        self.save_processed_url(profile_url, "No Connect Option", username)
+            for row_number, profile_url in queue:
+                if not self.should_continue() or not self.wait_for_circuit():
+                    return False
+                self.logger.info("Processing URL: %s", profile_url)
+                connection_attempts += 1
+                
+                status = self.with_recovery(profile_url, lambda: self.visit_and_connect(profile_url, note, username))
+                if status == "Connection Sent":
+                    successful_connections += 1
+                self.save_checkpoint(csv_path, username, MODE_TWO_PHASE, 'connect', row_number)
+                self.maybe_recycle_browser()
             
             self.logger.info(f"Connection process completed. Attempts: {connection_attempts}, Successful: {successful_connections}")
+            return True
         except Exception as e:
             self.logger.error(f"Error in connect_with_remaining: {str(e)}")
+            return False
 
-# Main execution
-if __name__ == "__main__":
-    bot = LinkedInBot()
-    bot.logger.info("=== LinkedIn Automation Script Started ===")
-    start_time = datetime.now()
-    
-    try:
-        csv_path = "C:/Users/Indhu/Downloads/inputs.csv"
-        bot.logger.info(f"Using CSV file: {csv_path}")
-        
-        username = input("Enter your username: ")
-        password = input("Enter your password: ")
-        
-        bot.setup_browser(headless=False)
-        
-        if not bot.login_to_linkedin(username, password):
-            bot.logger.error("Login failed, exiting script")
-            bot.browser.quit()
-            exit()
-        
-        # Pre-scan phase
-        bot.pre_scan_profiles(csv_path, username)
-
-        # Connect with remaining profiles
-        note = "Hey,\n\n It's always great connecting with classmates! Let's stay in touch and explore any opportunities to collaborate in the future. \n\nCheers,\nIndhu"
-        bot.connect_with_remaining(csv_path, note, username)
-        
-    except WebDriverException as e:
-        bot.logger.error(f"Critical WebDriver error in main execution: {str(e)}")
-    except Exception as e:
-        bot.logger.error(f"Critical error in main execution: {str(e)}")
-    finally:
+    def run_pipeline(self, csv_path, note, username, start_row=0):
+        """Single-pass mode: load each profile once, classify it and connect on the same page"""
+        self.logger.info("Starting single-pass profile pipeline...")
         try:
-            bot.browser.quit()
+            queue, stats = self.ingest(csv_path, username, 'pipeline', start_row)
+            self.progress.start('pipeline', len(queue), stats.total - len(queue))
+            successful_connections = 0
+            for index, (row_number, profile_url) in enumerate(queue, 1):
+                if not self.should_continue() or not self.wait_for_circuit():
+                    return False
+                self.logger.info("Processing profile %d/%d: %s", index, len(queue), profile_url)
+                status = self.with_recovery(profile_url, lambda: self.visit_and_connect(profile_url, note, username))
+                if status == "Connection Sent":
+                    successful_connections += 1
+                self.save_checkpoint(csv_path, username, MODE_PIPELINE, 'pipeline', row_number)
+                self.maybe_recycle_browser()
+
+            self.logger.info(f"Pipeline completed. Total profiles: {stats.total}, Skipped: {stats.total - len(queue)}, Successful: {successful_connections}")
+            return True
         except Exception as e:
-            bot.logger.error(f"Error while quitting the browser: {str(e)}")
-        end_time = datetime.now()
-        duration = end_time - start_time
-        bot.logger.info(f"=== Script completed in {duration} ===")
\ No newline at end of file
+            self.logger.error(f"Error in run_pipeline: {str(e)}")
+            return False
+
+    def run_profiles(self, csv_path, note, username, mode=MODE_PIPELINE, resume=False):
+        """Process the CSV in the given mode ('pipeline' or 'two_phase').
+
+        With resume, continue after the last checkpointed CSV row of an interrupted run.
+        Returns True when every phase ran to the end.
+        """
+        if self.note_policy == NOTE_ASK:
+            self.logger.info("Invitation note policy: ask for every profile")
+        else:
+            self.logger.info(f"Invitation note policy: {self.note_policy}, "
+                             f"{'sending with note' if self.should_send_note(note) else 'sending without note'}")
+        if mode not in (MODE_PIPELINE, MODE_TWO_PHASE):
+            raise ValueError(f"Unknown run mode: {mode}")
+
+        checkpoint_key = self.get_checkpoint_key(csv_path)
+        state_store = self.open_state_store(username)
+        phase, start_row = None, 0
+        if resume:
+            checkpoint = state_store.load_checkpoint(checkpoint_key)
+            if checkpoint is None:
+                self.logger.info("No checkpoint found, starting from the top of the CSV")
+            elif checkpoint['mode'] != mode:
+                self.logger.warning(f"Checkpoint was written in {checkpoint['mode']} mode, starting from the top of the CSV")
+            else:
+                phase, start_row = checkpoint['phase'], checkpoint['row_number']
+                position = (f"after CSV row {start_row}" if self.scheduler.preserves_csv_order
+                            else "with profiles finished before the interruption no longer due")
+                self.logger.info(f"Resuming {phase} {position} "
+                                 f"(checkpoint {checkpoint['timestamp']}, counters {checkpoint['counters']})")
+
+        if mode == MODE_TWO_PHASE:
+            completed = True
+            if phase != 'connect':
+                completed = self.pre_scan_profiles(csv_path, username, start_row)
+                start_row = 0
+            if not self.run_control.cancelled:
+                completed = self.connect_with_remaining(csv_path, note, username, start_row) and completed
+        else:
+            completed = self.run_pipeline(csv_path, note, username, start_row)
+
+        if completed:
+            state_store.clear_checkpoint(checkpoint_key)
+        else:
+            self.logger.info("Run stopped before the end, progress is checkpointed; rerun with resume to continue")
+        self.log_wait_summary()
+        if self.watchdog.peak_rss_mb:
+            self.logger.info(f"Peak sampled browser RSS: {self.watchdog.peak_rss_mb:.0f} MB")
+        self.write_metrics()
+        self.log_locator_summary()
+        self.locators.save()
+        return completed
+
+    def write_metrics(self):
+        """Write the per-stage histograms to metrics_path (Prometheus text, or CSV for .csv)"""
+        if not self.metrics_path:
+            return
+        try:
+            self.metrics.write(self.metrics_path)
+            self.logger.info(f"Run metrics written to {self.metrics_path} ({self.metrics.profiles_done} profiles, "
+                             f"{self.metrics.throughput():.1f} profiles/min)")
+        except OSError as e:
+            self.logger.error(f"Error writing run metrics to {self.metrics_path}: {str(e)}")
+
+    def log_wait_summary(self):
+        for step, stats in self.waiter.summary().items():
+            self.logger.info(
+                f"Wait '{step}': {stats['count']} waits, avg {stats['total'] / stats['count']:.2f}s, "
+                f"max {stats['max']:.2f}s, timeouts {stats['timeouts']}"
+            )
+
+    def log_locator_summary(self):
+        for key, rows in self.locators.summary().items():
+            for by, value, hits, misses, avg in rows:
+                if hits or misses:
+                    self.logger.debug(f"Locator '{key}' {by} {value!r}: {hits:.0f} hits, {misses:.0f} misses, "
+                                      f"avg {avg * 1000:.2f} ms")
+
+# Main execution
+if __name__ == "__main__":
+    from cli import main
+    main()
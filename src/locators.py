@@ -0,0 +1,257 @@
+import json
+import logging
+import os
+import threading
+import time
+
+LOCATOR_STATS_FILE = os.path.join(os.path.expanduser('~'), '.linkedin_bot', 'locator_stats.json')
+
+# Same strings as selenium's By.CSS_SELECTOR / By.XPATH, so a locator can go straight to find_elements
+CSS = 'css selector'
+XPATH = 'xpath'
+
+# Locator chains: alternatives for each element, reordered at run time by the LocatorEngine
+LOCATORS = {
+    'send_note_button': [
+        (XPATH, "//button[contains(@aria-label, 'Add a note')]"),
+        (CSS, "button[aria-label*='Add a note']"),
+    ],
+    'send_without_note_button': [
+        (XPATH, "//button[contains(@aria-label, 'Send without a note')]"),
+        (CSS, "button[aria-label*='Send without a note']"),
+    ],
+    'connect_to_invite': [
+        (XPATH, "(//main//button[contains(@aria-label, 'Invite')])[1]"),
+        (CSS, "main button[aria-label*='Invite']"),
+    ],
+    'note_text_box': [
+        (XPATH, "//textarea[contains(@name, 'message')]"),
+        (CSS, "textarea[name*='message']"),
+        (CSS, "#custom-message"),
+    ],
+    'send_invitation_confirmation_button': [
+        (XPATH, "//button[contains(@aria-label, 'Send invitation')]"),
+        (CSS, "button[aria-label*='Send invitation']"),
+    ],
+    'more_options': [
+        (XPATH, "//main//button[contains(@aria-label, 'More actions')]"),
+        (CSS, "main button[aria-label*='More actions']"),
+    ],
+    'invite_options': [
+        (XPATH, "//main//div[contains(@aria-label, 'to connect')]"),
+        (CSS, "main div[aria-label*='to connect']"),
+    ],
+    # CSS cannot match on text, so the distance badge only has XPath alternatives
+    'message_option': [
+        (XPATH, "//main//span[contains(@class, 'dist-value')][normalize-space()='1st']"),
+        (XPATH, "//span[text()='1st']"),
+    ],
+    'already_connected_indicator': [
+        (XPATH, "//main//span[contains(@class, 'dist-value')][normalize-space()='1st']"),
+        (XPATH, "//span[text()='1st']"),
+    ],
+}
+
+# LOCATORS entries read on every profile visit
+PROFILE_PROBE_KEYS = ['already_connected_indicator', 'connect_to_invite', 'more_options']
+
+# Counters are halved past this many attempts so a markup change outweighs old history quickly
+MAX_SAMPLES = 1000
+
+# Evaluates {key: [[by, value], ...]} chains in the page, stopping at the first alternative that
+# matches, and returns {key: [present, visible, element, [ms per alternative tried]]} so several
+# lookups and their timings cost a single WebDriver round trip
+PROBE_SCRIPT = """
+const chains = arguments[0];
+const result = {};
+for (const [key, chain] of Object.entries(chains)) {
+    let el = null;
+    const timings = [];
+    for (const [by, value] of chain) {
+        const start = performance.now();
+        try {
+            el = by === 'css selector'
+                ? document.querySelector(value)
+                : document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        } catch (e) {
+            el = null;
+        }
+        timings.push(performance.now() - start);
+        if (el) break;
+    }
+    let visible = false;
+    if (el) {
+        const style = window.getComputedStyle(el);
+        visible = !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length)
+            && style.visibility !== 'hidden' && style.display !== 'none';
+    }
+    result[key] = [el !== null, visible, el, timings];
+}
+return result;
+"""
+
+
+def classify_profile(probe):
+    """Connection status of a loaded profile from a probe of PROFILE_PROBE_KEYS"""
+    if probe['already_connected_indicator']['visible']:
+        return "Already Connected"
+    if probe['connect_to_invite']['visible']:
+        return "Not Connected"
+    return "No Connect Option"
+
+
+class LocatorStats:
+    """Hit/miss counts and lookup time of one alternative in a chain"""
+
+    def __init__(self, hits=0, misses=0, seconds=0.0):
+        self.hits = hits
+        self.misses = misses
+        self.seconds = seconds
+
+    @property
+    def attempts(self):
+        return self.hits + self.misses
+
+    def record(self, hit, seconds):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        self.seconds += seconds
+        if self.attempts > MAX_SAMPLES:
+            self.hits /= 2
+            self.misses /= 2
+            self.seconds /= 2
+
+    def expected_cost(self):
+        """Average lookup time divided by hit rate: the time this alternative costs per element found"""
+        return (self.seconds / self.attempts) / (self.hits / self.attempts)
+
+
+class LocatorEngine:
+    """Per-element chains of CSS/XPath alternatives, tried cheapest-successful first.
+
+    A miss is only charged to an alternative when a later one in the same lookup found the element;
+    lookups where nothing matches (the element is legitimately absent) leave the stats alone.
+    """
+
+    def __init__(self, chains, stats_path=LOCATOR_STATS_FILE, logger=None):
+        self.chains = {key: [tuple(locator) for locator in chain] for key, chain in chains.items()}
+        self.stats_path = stats_path
+        self.logger = logger or logging.getLogger(__name__)
+        self.stats = {key: {locator: LocatorStats() for locator in chain} for key, chain in self.chains.items()}
+        self.leaders = {key: chain[0] for key, chain in self.chains.items()}
+        self.lock = threading.Lock()
+        self.load()
+
+    def ordered(self, key):
+        stats = self.stats[key]
+
+        def rank(item):
+            index, locator = item
+            entry = stats[locator]
+            if entry.hits:
+                return (0, entry.expected_cost(), index)
+            # Untried fallbacks keep their declared order, ahead of ones that only ever missed
+            return (2 if entry.misses else 1, 0.0, index)
+
+        return [locator for _, locator in sorted(enumerate(self.chains[key]), key=rank)]
+
+    def chain(self, key):
+        """The key's alternatives in the order to try them"""
+        with self.lock:
+            ordered = self.ordered(key)
+            if ordered[0] != self.leaders[key]:
+                self.logger.info(f"Locator chain '{key}' reordered, now trying {ordered[0][0]} {ordered[0][1]!r} first")
+                self.leaders[key] = ordered[0]
+        return ordered
+
+    def record(self, key, attempts, found):
+        """attempts is the (locator, seconds) list of one lookup, in the order tried"""
+        if not found:
+            return
+        with self.lock:
+            last = len(attempts) - 1
+            for i, (locator, seconds) in enumerate(attempts):
+                self.stats[key][locator].record(i == last, seconds)
+
+    def find(self, driver, key, accept=None, record=True):
+        """First element matched by the chain (and accepted by the predicate, e.g. is_displayed), or None"""
+        attempts = []
+        found = None
+        for locator in self.chain(key):
+            start = time.perf_counter()
+            elements = driver.find_elements(*locator)
+            element = elements[0] if elements else None
+            if element is not None and accept is not None and not accept(element):
+                element = None
+            attempts.append((locator, time.perf_counter() - start))
+            if element is not None:
+                found = element
+                break
+        if record:
+            self.record(key, attempts, found is not None)
+        return found
+
+    def probe(self, driver, keys):
+        """Look up several keys in one execute_script call.
+
+        Returns {key: {'present': bool, 'visible': bool, 'element': WebElement or None}}.
+        """
+        chains = {key: self.chain(key) for key in keys}
+        raw = driver.execute_script(PROBE_SCRIPT, {key: [list(locator) for locator in chain]
+                                                   for key, chain in chains.items()})
+        result = {}
+        for key, (present, visible, element, timings) in raw.items():
+            attempts = [(locator, ms / 1000) for locator, ms in zip(chains[key], timings)]
+            self.record(key, attempts, bool(present))
+            result[key] = {'present': bool(present), 'visible': bool(visible), 'element': element}
+        return result
+
+    def summary(self):
+        """Return {key: [(by, value, hits, misses, avg_seconds), ...]} in the current try order"""
+        summary = {}
+        for key in self.chains:
+            rows = []
+            for locator in self.chain(key):
+                entry = self.stats[key][locator]
+                avg = entry.seconds / entry.attempts if entry.attempts else 0.0
+                rows.append((locator[0], locator[1], entry.hits, entry.misses, avg))
+            summary[key] = rows
+        return summary
+
+    def load(self):
+        """Merge stats saved by earlier runs; alternatives no longer in a chain are dropped"""
+        if not self.stats_path:
+            return
+        try:
+            with open(self.stats_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        for key, entries in data.items():
+            if key not in self.stats:
+                continue
+            for entry in entries:
+                locator = (entry['by'], entry['value'])
+                if locator in self.stats[key]:
+                    self.stats[key][locator] = LocatorStats(entry['hits'], entry['misses'], entry['seconds'])
+        self.leaders = {key: self.ordered(key)[0] for key in self.chains}
+
+    def save(self):
+        if not self.stats_path:
+            return
+        with self.lock:
+            data = {
+                key: [{'by': by, 'value': value, 'hits': entry.hits, 'misses': entry.misses, 'seconds': entry.seconds}
+                      for (by, value), entry in stats.items() if entry.attempts]
+                for key, stats in self.stats.items()
+            }
+        try:
+            os.makedirs(os.path.dirname(self.stats_path) or '.', exist_ok=True)
+            tmp_path = f'{self.stats_path}.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.stats_path)
+        except OSError as e:
+            self.logger.warning(f"Could not save locator stats to {self.stats_path}: {str(e)}")
@@ -0,0 +1,136 @@
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+# Upper bounds in seconds for the per-stage histograms; +Inf is implicit
+DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, seconds):
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.sum += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def cumulative(self):
+        """(upper_bound, cumulative_count) pairs in Prometheus order, ending with +Inf"""
+        running = 0
+        pairs = []
+        for bound, count in zip(list(self.buckets) + ['+Inf'], self.counts):
+            running += count
+            pairs.append((bound, running))
+        return pairs
+
+    def quantile(self, q):
+        """Bucket upper bound containing the q-quantile; coarse but needs no raw samples"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        for bound, running in self.cumulative():
+            if running >= target:
+                return self.max if bound == '+Inf' else min(bound, self.max)
+        return self.max
+
+
+class RunMetrics:
+    """Per-stage timing histograms and profile throughput for one run"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.histograms = {}
+        self.counters = {}
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.profiles_done = 0
+
+    def record(self, stage, seconds):
+        with self.lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def increment(self, event):
+        with self.lock:
+            self.counters[event] = self.counters.get(event, 0) + 1
+
+    @contextmanager
+    def span(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def profile_done(self):
+        with self.lock:
+            self.profiles_done += 1
+
+    def throughput(self):
+        """Profiles per minute since the metrics were created"""
+        elapsed = time.monotonic() - self.started
+        return self.profiles_done * 60 / elapsed if elapsed > 0 else 0.0
+
+    def to_prometheus(self):
+        lines = [
+            '# HELP linkedin_bot_stage_seconds Time spent per bot stage',
+            '# TYPE linkedin_bot_stage_seconds histogram',
+        ]
+        with self.lock:
+            for stage, histogram in sorted(self.histograms.items()):
+                for bound, running in histogram.cumulative():
+                    lines.append(f'linkedin_bot_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {running}')
+                lines.append(f'linkedin_bot_stage_seconds_sum{{stage="{stage}"}} {histogram.sum:.6f}')
+                lines.append(f'linkedin_bot_stage_seconds_count{{stage="{stage}"}} {histogram.count}')
+            lines.append('# TYPE linkedin_bot_profiles_total counter')
+            lines.append(f'linkedin_bot_profiles_total {self.profiles_done}')
+            if self.counters:
+                lines.append('# TYPE linkedin_bot_events_total counter')
+                for event, count in sorted(self.counters.items()):
+                    lines.append(f'linkedin_bot_events_total{{event="{event}"}} {count}')
+        return '\n'.join(lines) + '\n'
+
+    def to_csv(self):
+        lines = ['stage,count,total_seconds,avg_seconds,min_seconds,max_seconds,p50_seconds,p95_seconds']
+        with self.lock:
+            for stage, h in sorted(self.histograms.items()):
+                lines.append(
+                    f'{stage},{h.count},{h.sum:.6f},{h.sum / h.count:.6f},{h.min:.6f},{h.max:.6f},'
+                    f'{h.quantile(0.5):.6f},{h.quantile(0.95):.6f}'
+                )
+            for event, count in sorted(self.counters.items()):
+                lines.append(f'{event},{count},,,,,,')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path):
+        """Write the summary; '.csv' paths get CSV, anything else Prometheus text format"""
+        content = self.to_csv() if path.endswith('.csv') else self.to_prometheus()
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+
+def timed(stage):
+    """Method decorator recording each call's duration under stage in self.metrics"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.metrics.span(stage):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,87 @@
+import logging
+import queue
+import threading
+
+# Results written per transaction at most; the writer takes whatever has queued up to this size
+WRITE_BATCH_SIZE = 100
+
+
+class StoreWriter:
+    """The single thread that applies parallel workers' results to the ProcessedUrlStore.
+
+    Statuses queued with put() are upserted in batched transactions; checkpoint() rows are
+    handed to on_checkpoint from the same thread, after every status queued before them.
+    """
+
+    def __init__(self, store, on_checkpoint=None, logger=None):
+        self.store = store
+        self.on_checkpoint = on_checkpoint
+        self.logger = logger or logging.getLogger(__name__)
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self.run, name='store-writer', daemon=True)
+        self.written = 0
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def put(self, url, status, username=None):
+        """Same signature as LinkedInBot.save_processed_url so it can replace it in scan_profile"""
+        self.queue.put(('status', url, status))
+
+    def checkpoint(self, row_number):
+        self.queue.put(('checkpoint', row_number, None))
+
+    def close(self):
+        """Flush everything queued and stop the thread"""
+        self.queue.put(None)
+        self.thread.join()
+
+    def run(self):
+        stopping = False
+        while not stopping:
+            items = [self.queue.get()]
+            while len(items) < WRITE_BATCH_SIZE:
+                try:
+                    items.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            records, checkpoint = [], None
+            for item in items:
+                if item is None:
+                    stopping = True
+                elif item[0] == 'status':
+                    records.append((item[1], item[2]))
+                else:
+                    checkpoint = item[1]
+            try:
+                if records:
+                    self.store.upsert_many(records)
+                    self.written += len(records)
+                if checkpoint is not None and self.on_checkpoint is not None:
+                    self.on_checkpoint(checkpoint)
+            except Exception as e:
+                self.logger.error(f"Error writing {len(records)} scan results: {str(e)}")
+
+
+class CompletionWatermark:
+    """Highest CSV row such that it and every queued row before it are done.
+
+    Workers finish out of order, so this is the row a resume checkpoint can safely point at.
+    """
+
+    def __init__(self, row_numbers):
+        self.rows = sorted(row_numbers)
+        self.done = set()
+        self.index = 0
+        self.lock = threading.Lock()
+
+    def complete(self, row_number):
+        """Mark a row done; returns the new watermark if it moved, else None"""
+        with self.lock:
+            self.done.add(row_number)
+            start = self.index
+            while self.index < len(self.rows) and self.rows[self.index] in self.done:
+                self.done.discard(self.rows[self.index])
+                self.index += 1
+            return self.rows[self.index - 1] if self.index > start else None
@@ -0,0 +1,95 @@
+import threading
+import time
+from collections import Counter
+
+# Minimum seconds between progress notifications; fast loops are coalesced into one update
+DEFAULT_MIN_INTERVAL = 0.5
+
+
+class ProgressTracker:
+    """Counts per-phase progress and notifies listeners with throttled snapshots"""
+
+    def __init__(self, min_interval=DEFAULT_MIN_INTERVAL):
+        self.min_interval = min_interval
+        self.listeners = []
+        self.lock = threading.Lock()
+        self.last_emit = 0.0
+        self.reset('idle', 0)
+
+    def reset(self, phase, total, skipped=0):
+        self.phase = phase
+        self.total = total
+        self.skipped = skipped
+        self.processed = 0
+        self.status_counts = Counter()
+        self.started = time.monotonic()
+
+    def start(self, phase, total, skipped=0):
+        with self.lock:
+            self.reset(phase, total, skipped)
+        self.emit(force=True)
+
+    def update(self, status):
+        with self.lock:
+            self.processed += 1
+            self.status_counts[status or 'Failed'] += 1
+            done = self.processed >= self.total
+        self.emit(force=done)
+
+    def snapshot(self):
+        with self.lock:
+            elapsed = time.monotonic() - self.started
+            rate = self.processed * 60 / elapsed if elapsed > 0 else 0.0
+            remaining = max(self.total - self.processed, 0)
+            return {
+                'phase': self.phase,
+                'processed': self.processed,
+                'total': self.total,
+                'skipped': self.skipped,
+                'status_counts': dict(self.status_counts),
+                'profiles_per_minute': rate,
+                'eta_seconds': remaining * 60 / rate if rate > 0 else None,
+                'elapsed_seconds': elapsed,
+            }
+
+    def emit(self, force=False):
+        now = time.monotonic()
+        with self.lock:
+            if not force and now - self.last_emit < self.min_interval:
+                return
+            self.last_emit = now
+        snapshot = self.snapshot()
+        for listener in self.listeners:
+            listener(snapshot)
+
+
+class RunControl:
+    """Pause/resume/cancel flags checked by the run loops between profiles"""
+
+    def __init__(self):
+        self.running = threading.Event()
+        self.running.set()
+        self.cancelled_event = threading.Event()
+
+    @property
+    def paused(self):
+        return not self.running.is_set()
+
+    @property
+    def cancelled(self):
+        return self.cancelled_event.is_set()
+
+    def pause(self):
+        self.running.clear()
+
+    def resume(self):
+        self.running.set()
+
+    def cancel(self):
+        self.cancelled_event.set()
+        self.running.set()
+
+    def should_continue(self):
+        """Block while paused; returns False once the run has been cancelled"""
+        self.running.wait()
+        return not self.cancelled
@@ -0,0 +1,32 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket shared by every browser of a run.
+
+    Each acquire() takes one token, waiting until it is available, so no window of T seconds
+    grants more than capacity + rate * T tokens however many threads call it.
+    """
+
+    def __init__(self, rate, capacity=1):
+        if rate <= 0:
+            raise ValueError(f"Rate must be positive: {rate}")
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Take a token; returns the seconds spent waiting for it"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Reserve the token now, going into debt if needed, so waiters are served in order
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
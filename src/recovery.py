@@ -0,0 +1,106 @@
+import random
+import threading
+import time
+from collections import deque
+
+from selenium.common.exceptions import (
+    ElementClickInterceptedException, ElementNotInteractableException, InvalidSessionIdException,
+    NoSuchElementException, NoSuchWindowException, StaleElementReferenceException,
+    TimeoutException, WebDriverException,
+)
+
+# Failure classes: transient ones are retried on the same browser, page-shape ones are not
+# retried (the markup will not change), a lost session restarts the browser and logs in again,
+# and fatal ones abort the run.
+TRANSIENT = 'transient'
+PAGE_SHAPE = 'page_shape'
+SESSION_LOST = 'session_lost'
+FATAL = 'fatal'
+
+SESSION_LOST_MARKERS = (
+    'invalid session id', 'session deleted', 'chrome not reachable',
+    # Chrome's own 'disconnected: ...' errors; not net::ERR_INTERNET_DISCONNECTED, which is transient
+    'disconnected: not connected to devtools', 'disconnected: unable to connect to renderer',
+    'no such window', 'target window already closed', 'session not created', 'connection refused',
+    'max retries exceeded',
+)
+
+
+def classify_failure(error):
+    if isinstance(error, (InvalidSessionIdException, NoSuchWindowException)):
+        return SESSION_LOST
+    if isinstance(error, (TimeoutException, StaleElementReferenceException, ElementClickInterceptedException)):
+        return TRANSIENT
+    if isinstance(error, (NoSuchElementException, ElementNotInteractableException, KeyError)):
+        return PAGE_SHAPE
+    message = str(error).lower()
+    if any(marker in message for marker in SESSION_LOST_MARKERS):
+        return SESSION_LOST
+    if isinstance(error, (WebDriverException, ConnectionError)):
+        return TRANSIENT
+    return FATAL
+
+
+class RetryPolicy:
+    """Exponential backoff with jitter: base_delay * 2**(attempt - 1), capped at max_delay"""
+
+    def __init__(self, max_attempts=3, base_delay=2.0, max_delay=60.0, jitter=0.25):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+
+    def delay(self, attempt):
+        delay = min(self.base_delay * 2 ** (attempt - 1), self.max_delay)
+        return delay * (1 + random.uniform(-self.jitter, self.jitter))
+
+
+class CircuitBreaker:
+    """Opens when the failure rate over the last `window` profiles reaches `threshold`.
+
+    While open the run waits for `cooldown` seconds; the next profile is then tried as a probe.
+    """
+
+    def __init__(self, window=20, threshold=0.5, min_samples=5, cooldown=120.0):
+        self.window = window
+        self.threshold = threshold
+        self.min_samples = min_samples
+        self.cooldown = cooldown
+        self.results = deque(maxlen=window)
+        self.opened_at = None
+        self.probing = False
+        self.lock = threading.Lock()
+
+    def record(self, success):
+        with self.lock:
+            self.results.append(success)
+            if self.probing:
+                self.probing = False
+                self.opened_at = None if success else time.monotonic()
+            elif success:
+                self.opened_at = None
+            elif self.opened_at is None and len(self.results) >= self.min_samples \
+                    and self.failure_rate() >= self.threshold:
+                self.opened_at = time.monotonic()
+
+    def failure_rate(self):
+        if not self.results:
+            return 0.0
+        return self.results.count(False) / len(self.results)
+
+    @property
+    def is_open(self):
+        return self.opened_at is not None
+
+    def remaining_cooldown(self):
+        with self.lock:
+            if self.opened_at is None:
+                return 0.0
+            return max(0.0, self.opened_at + self.cooldown - time.monotonic())
+
+    def half_open(self):
+        """Cooldown over: the next result alone decides whether the breaker closes or reopens"""
+        with self.lock:
+            self.results.clear()
+            self.opened_at = None
+            self.probing = True
@@ -0,0 +1,12 @@
+# Run modes: 'pipeline' loads each profile once, 'two_phase' pre-scans everything first
+MODE_PIPELINE = 'pipeline'
+MODE_TWO_PHASE = 'two_phase'
+RUN_MODES = [MODE_PIPELINE, MODE_TWO_PHASE]
+
+# Invitation note policies, decided before the run instead of asking per profile
+NOTE_ALWAYS = 'always'
+NOTE_NEVER = 'never'
+NOTE_IF_FITS = 'if_fits'
+NOTE_ASK = 'ask'
+NOTE_POLICIES = [NOTE_IF_FITS, NOTE_ALWAYS, NOTE_NEVER, NOTE_ASK]
+NOTE_MAX_LENGTH = 300
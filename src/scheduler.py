@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta
+
+DAY = 24 * 60 * 60
+
+# Seconds before a profile with this status is worth visiting again; None means never
+DEFAULT_STATUS_TTLS = {
+    "Connected": None,
+    "Already Connected": None,
+    "Connection Sent": 7 * DAY,
+    "No Connect Option": 3 * DAY,
+    "Not Connected": 1 * DAY,
+}
+
+# Phases that send invitations must act on every profile a pre-scan classified "Not Connected",
+# including one left behind by a cancelled or failed two-phase run
+PHASE_TTL_OVERRIDES = {
+    'pipeline': {"Not Connected": 0},
+    'connect': {"Not Connected": 0},
+}
+
+# Lower is visited first; profiles never seen before come ahead of any revisit
+STATUS_PRIORITIES = {
+    None: 0,
+    "Not Connected": 1,
+    "No Connect Option": 2,
+    "Connection Sent": 3,
+}
+UNKNOWN_STATUS_PRIORITY = 1
+
+ORDER_STALENESS = 'staleness'
+ORDER_CSV = 'csv'
+
+
+class RevalidationScheduler:
+    """Decides which stored profiles are due for a re-check and in what order to visit them"""
+
+    def __init__(self, ttls=None, order=ORDER_STALENESS):
+        if order not in (ORDER_STALENESS, ORDER_CSV):
+            raise ValueError(f"Unknown queue order: {order}")
+        self.ttls = dict(DEFAULT_STATUS_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.order = order
+
+    @property
+    def preserves_csv_order(self):
+        return self.order == ORDER_CSV
+
+    def ttl(self, status, phase=None):
+        overrides = PHASE_TTL_OVERRIDES.get(phase, {})
+        if status in overrides:
+            return overrides[status]
+        # Statuses we do not know about (e.g. typos in old files) are always re-checked
+        return self.ttls.get(status, 0)
+
+    def is_due(self, record, phase=None, now=None):
+        """record is the store's {'status', 'timestamp'} dict, or None if never processed"""
+        if record is None:
+            return True
+        ttl = self.ttl(record['status'], phase)
+        if ttl is None:
+            return False
+        if ttl <= 0:
+            return True
+        try:
+            checked = datetime.fromisoformat(record['timestamp'])
+        except (TypeError, ValueError):
+            return True
+        return (now or datetime.now()) - checked >= timedelta(seconds=ttl)
+
+    def sort_key(self, record, row_number):
+        if self.order == ORDER_CSV:
+            return (row_number,)
+        if record is None:
+            return (STATUS_PRIORITIES[None], '', row_number)
+        priority = STATUS_PRIORITIES.get(record['status'], UNKNOWN_STATUS_PRIORITY)
+        # Oldest check first within a priority; the timestamp format sorts chronologically
+        return (priority, record['timestamp'] or '', row_number)
@@ -0,0 +1,85 @@
+import json
+import logging
+import os
+
+SESSION_DIR = os.path.join(os.path.expanduser('~'), '.linkedin_bot', 'sessions')
+# The cookie snapshot holds the li_at session token, so only the owner may read it
+PRIVATE_DIR_MODE = 0o700
+PRIVATE_FILE_MODE = 0o600
+
+
+class SessionManager:
+    """Per-account Chrome profile directory and cookie snapshot used to skip the login form"""
+
+    def __init__(self, root=SESSION_DIR, logger=None):
+        self.root = root
+        self.logger = logger or logging.getLogger(__name__)
+
+    def account_key(self, username):
+        return "".join(x for x in username if x.isalnum())
+
+    def account_dir(self, username):
+        path = os.path.join(self.root, self.account_key(username))
+        os.makedirs(path, mode=PRIVATE_DIR_MODE, exist_ok=True)
+        # makedirs leaves existing directories (and the umask) alone
+        os.chmod(path, PRIVATE_DIR_MODE)
+        return path
+
+    def profile_dir(self, username):
+        """Reusable Chrome user-data directory for the account"""
+        path = os.path.join(self.account_dir(username), 'chrome-profile')
+        os.makedirs(path, mode=PRIVATE_DIR_MODE, exist_ok=True)
+        return path
+
+    def cookie_file(self, username):
+        return os.path.join(self.root, self.account_key(username), 'cookies.json')
+
+    def has_cookies(self, username):
+        return os.path.exists(self.cookie_file(username))
+
+    def save_cookies(self, browser, username):
+        path = self.cookie_file(username)
+        try:
+            self.account_dir(username)
+            tmp_path = f'{path}.tmp'
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, PRIVATE_FILE_MODE)
+            with os.fdopen(fd, 'w') as f:
+                # A tmp file left by an earlier crash keeps its old mode through O_CREAT
+                os.chmod(tmp_path, PRIVATE_FILE_MODE)
+                json.dump(browser.get_cookies(), f)
+            os.replace(tmp_path, path)
+            self.logger.info(f"Saved session cookies for {username}")
+        except Exception as e:
+            self.logger.warning(f"Could not save session cookies for {username}: {str(e)}")
+
+    def restore_cookies(self, browser, username):
+        """Load the cookie snapshot into the current domain; returns the number of cookies added"""
+        try:
+            with open(self.cookie_file(username), 'r') as f:
+                cookies = json.load(f)
+        except (OSError, ValueError):
+            return 0
+        restored = self.add_cookies(browser, cookies)
+        self.logger.info(f"Restored {restored} session cookies for {username}")
+        return restored
+
+    def add_cookies(self, browser, cookies):
+        """Add get_cookies()-style dicts to the current domain; returns how many were accepted"""
+        added = 0
+        for cookie in cookies:
+            cookie = dict(cookie)
+            # Chrome rejects sameSite values it does not recognise and expiry as float
+            cookie.pop('sameSite', None)
+            if 'expiry' in cookie:
+                cookie['expiry'] = int(cookie['expiry'])
+            try:
+                browser.add_cookie(cookie)
+                added += 1
+            except Exception as e:
+                self.logger.debug(f"Skipping cookie {cookie.get('name')}: {str(e)}")
+        return added
+
+    def clear(self, username):
+        path = self.cookie_file(username)
+        if os.path.exists(path):
+            os.remove(path)
@@ -0,0 +1,168 @@
+"""Compressed DOM snapshots of visited profiles, and an offline classifier over them.
+
+classify_snapshots() re-runs the LOCATORS detection on stored pages in a process pool, without a
+browser. It needs lxml and cssselect, and only sees inline styles and the hidden attribute.
+"""
+import itertools
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from locators import classify_profile, CSS, LOCATORS, PROFILE_PROBE_KEYS
+
+DAY = 24 * 60 * 60
+DEFAULT_SNAPSHOT_TTL = 30 * DAY
+COMPRESSION_LEVEL = 6
+CLASSIFY_BATCH_SIZE = 500
+
+# Script and style bodies are most of a profile page and never matter to the locators
+STRIPPED_TAGS = re.compile(r'<(script|style)\b[^>]*>.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+HIDDEN_STYLE = re.compile(r'display\s*:\s*none|visibility\s*:\s*hidden', re.IGNORECASE)
+
+
+def snapshot_store_filename(username):
+    safe_username = "".join(x for x in username if x.isalnum())
+    return f'snapshots_{safe_username}.db'
+
+
+class SnapshotStore:
+    """SQLite (WAL mode) store of zlib-compressed page sources with a per-row TTL"""
+
+    SCHEMA = [
+        """CREATE TABLE IF NOT EXISTS snapshots (
+               url TEXT PRIMARY KEY,
+               html BLOB NOT NULL,
+               captured_at REAL NOT NULL,
+               ttl INTEGER NOT NULL
+           )""",
+        "CREATE INDEX IF NOT EXISTS idx_snapshots_expiry ON snapshots (captured_at + ttl)",
+    ]
+
+    def __init__(self, path, ttl=DEFAULT_SNAPSHOT_TTL, logger=None):
+        self.path = path
+        self.ttl = ttl
+        self.logger = logger or logging.getLogger(__name__)
+        self.conn = None
+        self.lock = threading.Lock()
+
+    def open(self):
+        if self.conn is not None:
+            return self
+        self.logger.info(f"Opening snapshot store: {self.path}")
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            for statement in self.SCHEMA:
+                self.conn.execute(statement)
+        return self
+
+    def close(self):
+        if self.conn is None:
+            return
+        with self.lock:
+            self.conn.close()
+            self.conn = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def put(self, url, html, captured_at=None):
+        blob = zlib.compress(STRIPPED_TAGS.sub('', html).encode('utf-8'), COMPRESSION_LEVEL)
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO snapshots (url, html, captured_at, ttl) VALUES (?, ?, ?, ?)",
+                (url, blob, captured_at or time.time(), self.ttl)
+            )
+        return len(blob)
+
+    def get(self, url, now=None):
+        """Decompressed page source, or None if there is no snapshot or it has expired"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT html FROM snapshots WHERE url = ? AND captured_at + ttl >= ?", (url, now or time.time())
+            ).fetchone()
+        return zlib.decompress(row[0]).decode('utf-8') if row else None
+
+    def count(self, now=None):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT COUNT(*) FROM snapshots WHERE captured_at + ttl >= ?", (now or time.time(),)
+            ).fetchone()
+        return row[0]
+
+    def iter_fresh(self, batch_size=CLASSIFY_BATCH_SIZE, now=None):
+        """Yield lists of (url, compressed html) for unexpired snapshots, batch_size rows at a time"""
+        now = now or time.time()
+        last_url = ''
+        while True:
+            with self.lock:
+                rows = self.conn.execute(
+                    "SELECT url, html FROM snapshots WHERE url > ? AND captured_at + ttl >= ? "
+                    "ORDER BY url LIMIT ?", (last_url, now, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            yield rows
+            last_url = rows[-1][0]
+
+    def prune(self, now=None):
+        """Delete expired snapshots; returns how many were removed"""
+        with self.lock, self.conn:
+            cursor = self.conn.execute("DELETE FROM snapshots WHERE captured_at + ttl < ?", (now or time.time(),))
+        if cursor.rowcount:
+            self.logger.info(f"Pruned {cursor.rowcount} expired snapshots from {self.path}")
+        return cursor.rowcount
+
+
+def is_rendered(element):
+    """Best offline guess at visibility: no hidden attribute or inline display/visibility on the way up"""
+    for node in itertools.chain([element], element.iterancestors()):
+        if node.get('hidden') is not None or HIDDEN_STYLE.search(node.get('style') or ''):
+            return False
+    return True
+
+
+def find_offline(document, chain):
+    """Evaluate a locator chain against a parsed page, in the same shape as LocatorEngine.probe"""
+    for by, value in chain:
+        matches = document.cssselect(value) if by == CSS else document.xpath(value)
+        if matches:
+            element = matches[0]
+            return {'present': True, 'visible': is_rendered(element), 'element': None}
+    return {'present': False, 'visible': False, 'element': None}
+
+
+def classify_snapshot(row, chains=LOCATORS):
+    """Worker: (url, compressed html) -> (url, status)"""
+    from lxml import html as lxml_html
+
+    url, blob = row
+    document = lxml_html.fromstring(zlib.decompress(blob).decode('utf-8'))
+    probe = {key: find_offline(document, chains[key]) for key in PROFILE_PROBE_KEYS}
+    return url, classify_profile(probe)
+
+
+def classify_snapshots(store, workers=None, chains=LOCATORS, logger=None):
+    """Classify every unexpired snapshot in a process pool; returns {url: status}"""
+    logger = logger or logging.getLogger(__name__)
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for batch in store.iter_fresh():
+            chunksize = max(1, len(batch) // (workers * 4))
+            results.update(pool.map(classify_snapshot, batch, itertools.repeat(chains), chunksize=chunksize))
+    elapsed = time.perf_counter() - start
+    logger.info(f"Classified {len(results)} snapshots with {workers} workers in {elapsed:.2f}s: "
+                f"{dict(Counter(results.values()))}")
+    return results
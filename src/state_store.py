@@ -0,0 +1,215 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def state_store_filename(username):
+    """Per-account store filename, relative to the working directory"""
+    safe_username = "".join(x for x in username if x.isalnum())
+    return f'processed_urls_{safe_username}.db'
+
+
+class ProcessedUrlStore:
+    """SQLite (WAL mode) store of processed profile URLs for one account"""
+
+    SCHEMA = [
+        """CREATE TABLE IF NOT EXISTS processed_urls (
+               url TEXT PRIMARY KEY,
+               status TEXT NOT NULL,
+               timestamp TEXT NOT NULL
+           )""",
+        "CREATE INDEX IF NOT EXISTS idx_processed_urls_status ON processed_urls (status)",
+        "CREATE INDEX IF NOT EXISTS idx_processed_urls_timestamp ON processed_urls (timestamp)",
+        """CREATE TABLE IF NOT EXISTS meta (
+               key TEXT PRIMARY KEY,
+               value TEXT NOT NULL
+           )""",
+        """CREATE TABLE IF NOT EXISTS checkpoints (
+               run_key TEXT PRIMARY KEY,
+               mode TEXT NOT NULL,
+               phase TEXT NOT NULL,
+               row_number INTEGER NOT NULL,
+               counters TEXT NOT NULL,
+               timestamp TEXT NOT NULL
+           )""",
+    ]
+
+    # Stay below SQLite's default host parameter limit
+    LOOKUP_BATCH_SIZE = 500
+
+    def __init__(self, path, logger=None):
+        self.path = path
+        self.logger = logger or logging.getLogger(__name__)
+        self.conn = None
+        self.lock = threading.Lock()
+
+    def open(self):
+        if self.conn is not None:
+            return self
+        self.logger.info(f"Opening state store: {self.path}")
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            for statement in self.SCHEMA:
+                self.conn.execute(statement)
+        return self
+
+    def close(self):
+        if self.conn is None:
+            return
+        with self.lock:
+            self.conn.close()
+            self.conn = None
+        self.logger.info(f"Closed state store: {self.path}")
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def get(self, url):
+        """Return {'status', 'timestamp'} for a URL, or None if it was never processed"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT status, timestamp FROM processed_urls WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'status': row[0], 'timestamp': row[1]}
+
+    def get_status(self, url):
+        record = self.get(url)
+        return record['status'] if record else None
+
+    def get_records(self, urls):
+        """Batch lookup; returns {url: {'status', 'timestamp'}} for the URLs that are in the store"""
+        records = {}
+        urls = list(urls)
+        with self.lock:
+            for i in range(0, len(urls), self.LOOKUP_BATCH_SIZE):
+                batch = urls[i:i + self.LOOKUP_BATCH_SIZE]
+                placeholders = ','.join('?' * len(batch))
+                rows = self.conn.execute(
+                    f"SELECT url, status, timestamp FROM processed_urls WHERE url IN ({placeholders})", batch
+                ).fetchall()
+                for url, status, timestamp in rows:
+                    records[url] = {'status': status, 'timestamp': timestamp}
+        return records
+
+    def upsert(self, url, status, timestamp=None):
+        timestamp = timestamp or datetime.now().strftime(TIMESTAMP_FORMAT)
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO processed_urls (url, status, timestamp) VALUES (?, ?, ?) "
+                "ON CONFLICT(url) DO UPDATE SET status = excluded.status, timestamp = excluded.timestamp",
+                (url, status, timestamp)
+            )
+
+    def upsert_many(self, records, timestamp=None):
+        """Upsert (url, status) pairs in one transaction"""
+        timestamp = timestamp or datetime.now().strftime(TIMESTAMP_FORMAT)
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT INTO processed_urls (url, status, timestamp) VALUES (?, ?, ?) "
+                "ON CONFLICT(url) DO UPDATE SET status = excluded.status, timestamp = excluded.timestamp",
+                [(url, status, timestamp) for url, status in records]
+            )
+
+    def count(self, status=None):
+        with self.lock:
+            if status is None:
+                row = self.conn.execute("SELECT COUNT(*) FROM processed_urls").fetchone()
+            else:
+                row = self.conn.execute(
+                    "SELECT COUNT(*) FROM processed_urls WHERE status = ?", (status,)
+                ).fetchone()
+        return row[0]
+
+    def count_by_status(self):
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT status, COUNT(*) FROM processed_urls GROUP BY status ORDER BY COUNT(*) DESC"
+            ).fetchall()
+        return dict(rows)
+
+    def load_all(self):
+        """Return every record as the {url: {'status', 'timestamp'}} dict the JSON files used"""
+        with self.lock:
+            rows = self.conn.execute("SELECT url, status, timestamp FROM processed_urls").fetchall()
+        return {url: {'status': status, 'timestamp': timestamp} for url, status, timestamp in rows}
+
+    def get_meta(self, key, default=None):
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO meta (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, str(value))
+            )
+
+    def save_checkpoint(self, run_key, mode, phase, row_number, counters):
+        """Record the last CSV row completed in a phase so an interrupted run can resume"""
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO checkpoints (run_key, mode, phase, row_number, counters, timestamp) "
+                "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(run_key) DO UPDATE SET mode = excluded.mode, "
+                "phase = excluded.phase, row_number = excluded.row_number, counters = excluded.counters, "
+                "timestamp = excluded.timestamp",
+                (run_key, mode, phase, row_number, json.dumps(counters),
+                 datetime.now().strftime(TIMESTAMP_FORMAT))
+            )
+
+    def load_checkpoint(self, run_key):
+        """Return {'mode', 'phase', 'row_number', 'counters', 'timestamp'} or None"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT mode, phase, row_number, counters, timestamp FROM checkpoints WHERE run_key = ?",
+                (run_key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'mode': row[0], 'phase': row[1], 'row_number': row[2],
+                'counters': json.loads(row[3]), 'timestamp': row[4]}
+
+    def clear_checkpoint(self, run_key):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM checkpoints WHERE run_key = ?", (run_key,))
+
+    def import_json(self, json_path):
+        """One-time import of a legacy processed_urls_<user>.json file"""
+        if not os.path.exists(json_path):
+            return 0
+        if self.get_meta(f'imported:{json_path}'):
+            self.logger.debug(f"Legacy file already imported: {json_path}")
+            return 0
+        try:
+            with open(json_path, 'r') as f:
+                data = json.load(f)
+        except Exception as e:
+            self.logger.error(f"Error reading legacy processed URLs file {json_path}: {str(e)}")
+            return 0
+
+        rows = [
+            (url, record.get('status', ''), record.get('timestamp') or datetime.now().strftime(TIMESTAMP_FORMAT))
+            for url, record in data.items()
+        ]
+        with self.lock, self.conn:
+            # Existing rows are newer than anything in the legacy file, keep them
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO processed_urls (url, status, timestamp) VALUES (?, ?, ?)",
+                rows
+            )
+        self.set_meta(f'imported:{json_path}', datetime.now().strftime(TIMESTAMP_FORMAT))
+        self.logger.info(f"Imported {len(rows)} URLs from legacy file {json_path}")
+        return len(rows)
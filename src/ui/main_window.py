@@ -1,33 +1,71 @@
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                             QLineEdit, QTextEdit, QPushButton, QLabel, 
-                            QFileDialog, QProgressBar, QMessageBox)
+                            QFileDialog, QProgressBar, QMessageBox, QCheckBox,
+                            QComboBox, QInputDialog)
 from PyQt6.QtCore import Qt, QThread, pyqtSignal
 from PyQt6.QtGui import QIcon, QFont
 import os
 import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from linkedin_bot import LinkedInBot  # Use absolute import
+from linkedin_bot import (LinkedInBot, MODE_PIPELINE, MODE_TWO_PHASE,  # Use absolute import
+                          NOTE_IF_FITS, NOTE_ALWAYS, NOTE_NEVER)
+import queue
+
+# Policies offered in the UI; NOTE_ASK needs a console so it is CLI-only
+NOTE_POLICY_LABELS = {
+    NOTE_IF_FITS: "Send note if it fits (300 characters)",
+    NOTE_ALWAYS: "Always send note",
+    NOTE_NEVER: "Never send note",
+}
 
 
 
 class WorkerThread(QThread):
     progress = pyqtSignal(str)
     finished = pyqtSignal(bool, str)
+    otp_requested = pyqtSignal()
+    progress_update = pyqtSignal(dict)
 
-    def __init__(self, username, password, csv_path, note):
+    def __init__(self, username, password, csv_path, note, mode=MODE_PIPELINE, lean=False,
+                 note_policy=NOTE_IF_FITS, resume=False):
         super().__init__()
         self.username = username
         self.password = password
         self.csv_path = csv_path
         self.note = note
-        self.bot = LinkedInBot()
+        self.mode = mode
+        self.lean = lean
+        self.resume = resume
+        self.otp_answers = queue.Queue()
+        self.bot = LinkedInBot(note_policy=note_policy, otp_callback=self.request_otp)
+
+    def request_otp(self):
+        """Called on the worker thread; blocks until the UI answers through submit_otp"""
+        self.otp_requested.emit()
+        try:
+            return self.otp_answers.get(timeout=300)
+        except queue.Empty:
+            return None
+
+    def submit_otp(self, code):
+        self.otp_answers.put(code)
+
+    def pause(self):
+        self.bot.run_control.pause()
+
+    def resume_run(self):
+        self.bot.run_control.resume()
+
+    def cancel(self):
+        self.bot.run_control.cancel()
+        self.otp_answers.put(None)
 
     def run(self):
         try:
             # Initialize browser
             self.progress.emit("Setting up browser...")
-            browser = self.bot.setup_browser()
+            self.bot.setup_browser(username=self.username, lean=self.lean)
 
             # Login
             self.progress.emit("Logging in to LinkedIn...")
@@ -35,20 +73,24 @@ class WorkerThread(QThread):
                 self.finished.emit(False, "Login failed")
                 return
 
-            # Pre-scan profiles
-            self.progress.emit("Pre-scanning profiles...")
-            self.bot.pre_scan_profiles(browser, self.csv_path, self.username)
+            self.progress.emit("Pre-scanning and connecting with profiles..." if self.mode == MODE_TWO_PHASE
+                               else "Processing profiles...")
+            self.bot.progress.listeners.append(self.progress_update.emit)
+            completed = self.bot.run_profiles(self.csv_path, self.note, self.username,
+                                              mode=self.mode, resume=self.resume)
 
-            # Connect with remaining
-            self.progress.emit("Connecting with profiles...")
-            self.bot.connect_with_remaining(browser, self.csv_path, self.note, self.username)
-
-            self.finished.emit(True, "Process completed successfully")
+            if completed:
+                self.finished.emit(True, "Process completed successfully")
+            elif self.bot.run_control.cancelled:
+                self.finished.emit(False, "Cancelled. Progress is saved, tick 'Resume' to continue later.")
+            else:
+                self.finished.emit(False, "Run stopped early. Progress is saved, tick 'Resume' to continue.")
         except Exception as e:
             self.finished.emit(False, f"Error: {str(e)}")
         finally:
-            if hasattr(self.bot, 'browser'):
+            if self.bot.browser is not None:
                 self.bot.browser.quit()
+            self.bot.close_state_store()
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -77,17 +119,42 @@ class MainWindow(QMainWindow):
         note_group = self.create_group_box("Connection Note")
         layout.addWidget(note_group)
 
+        # Run mode
+        self.two_phase_checkbox = QCheckBox("Pre-scan all profiles before connecting (two-phase mode)")
+        layout.addWidget(self.two_phase_checkbox)
+        self.lean_checkbox = QCheckBox("Lean page loading (eager load, block images, fonts and trackers)")
+        layout.addWidget(self.lean_checkbox)
+        self.resume_checkbox = QCheckBox("Resume from the last checkpoint of this CSV")
+        layout.addWidget(self.resume_checkbox)
+
         # Progress section
         self.progress_bar = QProgressBar()
         self.status_label = QLabel("Ready")
         layout.addWidget(self.progress_bar)
         layout.addWidget(self.status_label)
 
+        self.note_policy_combo = QComboBox()
+        for policy, label in NOTE_POLICY_LABELS.items():
+            self.note_policy_combo.addItem(label, policy)
+        layout.addWidget(self.note_policy_combo)
+
         # Start button
         self.start_button = QPushButton("Start Automation")
         self.start_button.clicked.connect(self.start_automation)
         layout.addWidget(self.start_button)
 
+        # Run controls
+        controls_layout = QHBoxLayout()
+        self.pause_button = QPushButton("Pause")
+        self.pause_button.clicked.connect(self.toggle_pause)
+        self.pause_button.setEnabled(False)
+        controls_layout.addWidget(self.pause_button)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.clicked.connect(self.cancel_automation)
+        self.cancel_button.setEnabled(False)
+        controls_layout.addWidget(self.cancel_button)
+        layout.addLayout(controls_layout)
+
     def create_group_box(self, title):
         group = QWidget()
         layout = QVBoxLayout(group)
@@ -142,11 +209,36 @@ class MainWindow(QMainWindow):
             self.username_input.text(),
             self.password_input.text(),
             self.file_path_input.text(),
-            self.note_input.toPlainText()
+            self.note_input.toPlainText(),
+            MODE_TWO_PHASE if self.two_phase_checkbox.isChecked() else MODE_PIPELINE,
+            self.lean_checkbox.isChecked(),
+            self.note_policy_combo.currentData(),
+            self.resume_checkbox.isChecked()
         )
         self.worker.progress.connect(self.update_progress)
+        self.worker.progress_update.connect(self.update_progress_stats)
+        self.worker.otp_requested.connect(self.ask_for_otp)
         self.worker.finished.connect(self.on_completion)
         self.worker.start()
+        self.pause_button.setText("Pause")
+        self.pause_button.setEnabled(True)
+        self.cancel_button.setEnabled(True)
+
+    def toggle_pause(self):
+        if self.worker.bot.run_control.paused:
+            self.worker.resume_run()
+            self.pause_button.setText("Pause")
+            self.status_label.setText("Resuming...")
+        else:
+            self.worker.pause()
+            self.pause_button.setText("Resume")
+            self.status_label.setText("Pausing after the current profile...")
+
+    def cancel_automation(self):
+        self.worker.cancel()
+        self.pause_button.setEnabled(False)
+        self.cancel_button.setEnabled(False)
+        self.status_label.setText("Cancelling after the current profile...")
 
     def validate_inputs(self):
         if not self.username_input.text():
@@ -163,14 +255,32 @@ class MainWindow(QMainWindow):
             return False
         return True
 
+    def ask_for_otp(self):
+        code, ok = QInputDialog.getText(self, "Verification", "Enter the OTP sent to your phone:")
+        self.worker.submit_otp(code.strip() if ok else None)
+
     def show_error(self, message):
         QMessageBox.critical(self, "Error", message)
 
     def update_progress(self, message):
         self.status_label.setText(message)
 
+    def update_progress_stats(self, snapshot):
+        self.progress_bar.setMaximum(max(snapshot['total'], 1))
+        self.progress_bar.setValue(snapshot['processed'])
+        counts = ", ".join(f"{status}: {count}" for status, count in sorted(snapshot['status_counts'].items()))
+        eta = snapshot['eta_seconds']
+        eta_text = f"{int(eta // 60)}m {int(eta % 60)}s" if eta is not None else "--"
+        self.status_label.setText(
+            f"{snapshot['phase']}: {snapshot['processed']}/{snapshot['total']} "
+            f"({snapshot['skipped']} skipped) | {snapshot['profiles_per_minute']:.1f}/min | ETA {eta_text}"
+            + (f"\n{counts}" if counts else "")
+        )
+
     def on_completion(self, success, message):
         self.start_button.setEnabled(True)
+        self.pause_button.setEnabled(False)
+        self.cancel_button.setEnabled(False)
         if success:
             QMessageBox.information(self, "Success", message)
         else:
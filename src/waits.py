@@ -0,0 +1,86 @@
+import logging
+import time
+from collections import defaultdict
+
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+
+# Per-step timeouts in seconds, override any of them through LinkedInBot(wait_timeouts=...)
+DEFAULT_WAIT_TIMEOUTS = {
+    'session_probe': 5,
+    'login_result': 120,
+    'profile_load': 10,
+    'invite_modal': 5,
+    'note_text_box': 5,
+    'send_invitation_confirmation': 5,
+    'invitation_sent': 5,
+}
+
+
+class StepWaiter:
+    """Condition-based waits on locator chains with per-step timeouts and recorded wait durations"""
+
+    def __init__(self, timeouts=None, logger=None, poll_frequency=0.1, metrics=None, locators=None):
+        self.timeouts = dict(DEFAULT_WAIT_TIMEOUTS)
+        if timeouts:
+            self.timeouts.update(timeouts)
+        self.logger = logger or logging.getLogger(__name__)
+        self.poll_frequency = poll_frequency
+        self.metrics = metrics
+        self.locators = locators
+        self.timings = defaultdict(list)
+        self.timeouts_hit = defaultdict(int)
+
+    def wait(self, browser, step, condition):
+        """Wait for condition within the step's timeout; returns its result, or None on timeout"""
+        timeout = self.timeouts.get(step, 10)
+        start = time.perf_counter()
+        try:
+            result = WebDriverWait(browser, timeout, poll_frequency=self.poll_frequency).until(condition)
+        except TimeoutException:
+            result = None
+            self.timeouts_hit[step] += 1
+        elapsed = time.perf_counter() - start
+        self.timings[step].append(elapsed)
+        if self.metrics is not None:
+            self.metrics.record(f'wait:{step}', elapsed)
+        self.logger.debug("Wait '%s' %s after %.3fs", step, 'timed out' if result is None else 'satisfied', elapsed)
+        return result
+
+    def for_element(self, browser, step, key, clickable=False):
+        """Wait until the key's locator chain finds a visible (and, with clickable, enabled) element"""
+        def accept(element):
+            return element.is_displayed() and (not clickable or element.is_enabled())
+
+        def condition(driver):
+            try:
+                return self.locators.find(driver, key, accept)
+            except StaleElementReferenceException:
+                return False
+        return self.wait(browser, step, condition)
+
+    def for_any(self, browser, step, keys):
+        """Wait until any of the keys is present; one probe script per poll instead of a lookup per locator"""
+        def condition(driver):
+            return any(found['present'] for found in self.locators.probe(driver, keys).values())
+        return self.wait(browser, step, condition)
+
+    def until_gone(self, browser, step, key):
+        def condition(driver):
+            try:
+                return self.locators.find(driver, key, lambda element: element.is_displayed(), record=False) is None
+            except StaleElementReferenceException:
+                return True
+        return self.wait(browser, step, condition)
+
+    def summary(self):
+        """Return {step: {'count', 'total', 'max', 'timeouts'}} for every step waited on"""
+        return {
+            step: {
+                'count': len(durations),
+                'total': sum(durations),
+                'max': max(durations),
+                'timeouts': self.timeouts_hit[step],
+            }
+            for step, durations in self.timings.items()
+        }
@@ -0,0 +1,35 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from ingest import canonicalize_url  # noqa: E402
+
+PROFILE = 'https://www.linkedin.com/in/jane-doe/'
+
+
+def test_spellings_of_one_profile_share_a_key():
+    for url in ['https://www.linkedin.com/in/jane-doe/', 'http://linkedin.com/in/Jane-Doe',
+                ' www.linkedin.com/in/jane-doe?trk=abc#top ', 'https://uk.linkedin.com//in/JANE-DOE//',
+                'https://www.linkedin.com/in/jane%2Ddoe/']:
+        assert canonicalize_url(url) == PROFILE, url
+
+
+def test_blank_and_non_profile_linkedin_urls_are_invalid():
+    for url in ['', '   ', None, 'linkedin.com', 'https://www.linkedin.com/', 'https://www.linkedin.com/in/',
+                'https://www.linkedin.com/company/acme/', 'https://www.linkedin.com/feed/', 'http://[::1']:
+        assert canonicalize_url(url) is None, url
+
+
+def test_encoded_slash_is_not_decoded_into_a_path_separator():
+    assert canonicalize_url('https://www.linkedin.com/in/a%2Fb/') == 'https://www.linkedin.com/in/a%2Fb/'
+    assert canonicalize_url('https://www.linkedin.com/in/a%2fb/') == 'https://www.linkedin.com/in/a%2Fb/'
+
+
+def test_non_ascii_slugs_are_lowercased_and_escaped_once():
+    assert canonicalize_url('https://www.linkedin.com/in/José/') == canonicalize_url(
+        'https://www.linkedin.com/in/jos%C3%A9/') == 'https://www.linkedin.com/in/jos%C3%A9/'
+
+
+def test_other_hosts_keep_scheme_port_and_path():
+    assert canonicalize_url('http://127.0.0.1:8000/in/Sim-1?x=1') == 'http://127.0.0.1:8000/in/Sim-1/'